@@ -0,0 +1,10 @@
+import sys
+
+from pathlib import Path
+
+# the modules of the app are imported relative to the root of the repository
+sys.path.insert(0, str(Path(__file__).parent))
+
+from interface.cli import main
+
+main()
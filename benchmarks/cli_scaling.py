@@ -0,0 +1,75 @@
+"""Benchmark for the scaling of the csv export over the number of worker processes.
+
+Writes the same dataset like the command line interface (generate --workers N) to a
+temporary file for a growing number of workers and reports the throughput and the
+speedup compared to the serial export. For reference, the generation alone is
+measured as well. Run it from the root of the repository:
+
+    python -m benchmarks.cli_scaling
+"""
+import os
+import time
+
+import toml
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from utils.configuration import Configuration
+from utils.export import write_csv
+from utils.generation import iter_observation_chunks, iter_observation_chunks_parallel
+
+# number of screw runs per type of observation
+RUNS_PER_TYPE = 4000
+
+
+def get_workers() -> "list[int]":
+    """Returns 1, 2, 4, ... up to the number of CPUs (and at least 2)."""
+    cpus = os.cpu_count() or 1
+    workers = [1]
+    while workers[-1] < max(cpus, 2):
+        workers.append(min(2 * workers[-1], max(cpus, 2)))
+    return workers
+
+
+def measure_export(Config: Configuration, workers: int) -> float:
+    """Returns the duration of the export with the given number of workers in seconds."""
+    with TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        with open(Path(directory) / "screw_data.csv", "wb") as file:
+            if workers > 1:
+                chunks = iter_observation_chunks_parallel(
+                    Config, max_workers=workers, format_csv=True
+                )
+            else:
+                chunks = iter_observation_chunks(Config)
+            write_csv(chunks, file)
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    parameter = toml.load(Path(__file__).parent.parent / "config/parameter.toml")
+    Config = Configuration(parameter)
+    Config.number_of_ok = RUNS_PER_TYPE
+    Config.anomaly_type_1_generate_amount = RUNS_PER_TYPE
+    Config.anomaly_type_2_generate_amount = RUNS_PER_TYPE
+    Config.anomaly_type_3_generate_amount = RUNS_PER_TYPE
+    Config.anomaly_type_4_generate_amount = RUNS_PER_TYPE
+    runs = 5 * RUNS_PER_TYPE
+
+    start = time.perf_counter()
+    for _ in iter_observation_chunks(Config):
+        pass
+    generation = runs / (time.perf_counter() - start)
+    print(f"{runs} screw runs on {os.cpu_count()} CPUs")
+    print(f"generation only (serial): {generation:.0f} runs/s")
+
+    print(f"{'workers':>7}{'runs/s':>10}{'speedup':>9}")
+    serial = None
+    for workers in get_workers():
+        throughput = runs / measure_export(Config, workers)
+        serial = serial or throughput
+        print(f"{workers:>7}{throughput:>10.0f}{throughput / serial:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark for the import time of the app (cold start).
+
+Every module is imported in a new interpreter with "python -X importtime", so the
+caches of previous imports do not affect the measurement. Run it from the root of
+the repository:
+
+    python benchmarks/import_time.py
+"""
+import re
+import subprocess
+import sys
+
+from pathlib import Path
+from typing import Dict
+
+# modules that are imported at start of the app and when a page is opened
+MODULES = [
+    "interface.interface",
+    "pages.home",
+    "pages.baseline",
+    "pages.normal",
+    "pages.anormal",
+    "pages.download",
+]
+# heavy dependencies that should only be imported when needed
+DEPENDENCIES = ["streamlit", "bokeh", "pandas", "scipy", "PIL"]
+
+
+def measure_import(module: str) -> Dict[str, int]:
+    """Returns the cumulative import time in microseconds of all imported packages."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    # lines are "import time: self [us] | cumulative | imported package"
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        if match:
+            times[match.group(3)] = int(match.group(1))
+    return times
+
+
+def main() -> None:
+    print(f"{'module':<22}{'total [ms]':>12}  heavy dependencies")
+    for module in MODULES:
+        times = measure_import(module)
+        heavy = [name for name in DEPENDENCIES if name in times]
+        total = times[module] / 1000
+        print(f"{module:<22}{total:>12.1f}  {', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark for the Savitzky-Golay filter of a batch over the window length.
+
+Measures the direct and the FFT-based correlation of utils.filter on the grid of the
+default configuration, which is used to choose FFT_WINDOW_LENGTH, and the complete
+filter including the edges of every run. Run it from the root of the repository:
+
+    python -m benchmarks.savgol
+"""
+import time
+
+import toml
+
+from pathlib import Path
+from typing import Callable
+
+from scipy.ndimage import correlate1d
+from scipy.signal import fftconvolve
+from utils.configuration import Configuration
+from utils.filter import FFT_WINDOW_LENGTH, get_savgol_weights
+from utils.observation import ObservationBatch
+
+# number of runs of the measured batch
+RUNS = 2000
+# window lengths to measure (odd numbers of points)
+WINDOW_LENGTHS = [9, 21, 25, 29, 31, 33, 41, 49, 57, 65, 81, 101, 151, 201, 301]
+
+
+def measure(function: Callable[[], object], repeat: int = 7) -> float:
+    """Returns the fastest of <repeat> calls in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parameter = toml.load(Path(__file__).parent.parent / "config/parameter.toml")
+    Config = Configuration(parameter)
+    Config.filter_apply = 1
+    Config.filter_type_selected = "Savitzky-Golay-Filter"
+    batch = ObservationBatch(Config, "ok", RUNS)
+    x_values = batch.x_values
+    y_values = batch.apply_linear_interpolation(x_values)
+    polyorder = int(Config.filter_sg_poly_order)
+
+    print(f"{RUNS} runs with {len(x_values)} x values, FFT from {FFT_WINDOW_LENGTH}")
+    print(f"{'window':>6}{'direct [ms]':>14}{'fft [ms]':>11}{'filter [ms]':>14}")
+    for window_length in WINDOW_LENGTHS:
+        Config.filter_sg_window_length = window_length
+        weights = get_savgol_weights(window_length, polyorder)
+        direct = measure(lambda: correlate1d(y_values, weights, axis=1, mode="nearest"))
+        fft = measure(
+            lambda: fftconvolve(y_values, weights[None, ::-1], mode="same", axes=1)
+        )
+        total = measure(
+            lambda: batch.apply_savitzky_golay_filter(y_values, Config, x_values)
+        )
+        print(f"{window_length:>6}{direct:>14.1f}{fft:>11.1f}{total:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
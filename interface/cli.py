@@ -0,0 +1,100 @@
+import argparse
+import sys
+import time
+
+from pathlib import Path
+from typing import List, Optional
+from utils.configuration import Configuration
+from utils.export import write_csv
+from utils.generation import (
+    CHUNK_SIZE,
+    OBS_TYPES,
+    get_amount,
+    iter_observation_chunks,
+    iter_observation_chunks_parallel,
+)
+from utils.load import get_config
+from utils.progress import Progress, ProgressReporter
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """Returns the parser for the arguments of the command line interface."""
+    parser = argparse.ArgumentParser(
+        prog="screw_data",
+        description="Generate synthetic screw driving data without the web app.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser(
+        "generate", help="generate the dataset of a parameter file as csv"
+    )
+    generate.add_argument(
+        "--config",
+        default="parameter.toml",
+        help="parameter file (relative to the config folder or absolute path)",
+    )
+    generate.add_argument(
+        "--out", default=".", help="output directory for screw_data.csv"
+    )
+    generate.add_argument(
+        "--workers", type=int, default=1, help="number of worker processes"
+    )
+    generate.add_argument(
+        "--chunk-size",
+        type=int,
+        default=CHUNK_SIZE,
+        help="maximum number of observations per chunk",
+    )
+    return parser
+
+
+def generate(config: str, out: str, workers: int, chunk_size: int) -> None:
+    """Generates the dataset according to the parameter file and writes it to out.
+
+    Parameters
+    ----------
+    config : str
+        Filename of the parameter file, relative to the config folder.
+    out : str
+        Output directory for the file screw_data.csv.
+    workers : int
+        Number of worker processes, generates in the current process for one.
+    chunk_size : int
+        Maximum number of observations per chunk.
+    """
+    parameter, _, _ = get_config(config, "info_text.toml", "readme.toml")
+    Config = Configuration(parameter)
+
+    if workers > 1:
+        # the workers also format the csv rows, the parent only writes them
+        chunks = iter_observation_chunks_parallel(
+            Config, chunk_size, workers, format_csv=True
+        )
+    else:
+        chunks = iter_observation_chunks(Config, chunk_size)
+
+    path = Path(out) / "screw_data.csv"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    total = sum(get_amount(Config, obs_type) for obs_type in OBS_TYPES)
+    start = time.perf_counter()
+    with open(path, "wb") as file:
+        with ProgressReporter(total, show_progress, interval=1.0) as progress:
+            written = write_csv(chunks, file, progress)
+    # keep the last progress line
+    print(file=sys.stderr)
+    duration = time.perf_counter() - start
+
+    print(f"Generated {written} screw runs in {duration:.2f}s -> {path}")
+    print(f"Throughput: {written / max(duration, 1e-9):.1f} screw runs per second")
+
+
+def show_progress(progress: Progress) -> None:
+    """Overwrites the current line of stderr with the progress of the generation."""
+    print(f"\r{progress}", end="", file=sys.stderr, flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs the command line interface (python -m screw_data)."""
+    args = get_parser().parse_args(argv)
+    if args.command == "generate":
+        generate(args.config, args.out, args.workers, args.chunk_size)
@@ -1,12 +1,19 @@
 import streamlit as st
 
+from importlib import import_module
 from streamlit_option_menu import option_menu
 
 from utils.load import get_config
-from utils.observation import Observation
-from utils.configuration import Configuration
+from utils.configuration import Configuration, auto_apply
 
-from pages import baseline, home, normal, anormal, download
+# modules of the pages, imported only when they are selected in the main menu
+PAGES = {
+    "Home": "pages.home",
+    "Baseline": "pages.baseline",
+    "Normal": "pages.normal",
+    "Anormal": "pages.anormal",
+    "Download": "pages.download",
+}
 
 
 def launch():
@@ -43,7 +50,7 @@ def launch():
     # load the main menu for all pages
     selected = option_menu(
         menu_title=None,
-        options=["Home", "Baseline", "Normal", "Anormal", "Download"],
+        options=list(PAGES),
         icons=["house", "caret-right", "check-circle", "x-circle", "download"],
         default_index=0,
         orientation="horizontal",
@@ -52,18 +59,15 @@ def launch():
     # set default view to sidebar
     st.sidebar.write("nikolai.west@udo.edu")
     st.sidebar.title("- 🔧 ————— Settings ————— 🔩 -")
+    # apply the settings by a button (default) or automatically after every change
+    auto_apply()
 
     # import config from parameter (.toml)
     Config = Configuration(parameter)
 
-    # run pages by selection in main menu
+    # import and run the page by selection in main menu
+    page = import_module(PAGES[selected])
     if selected == "Home":
-        home.run()
-    if selected == "Baseline":
-        baseline.run(Config, parameter, info_text)
-    if selected == "Normal":
-        normal.run(Config, parameter, info_text)
-    if selected == "Anormal":
-        anormal.run(Config, parameter, info_text)
-    if selected == "Download":
-        download.run(Config, parameter, info_text)
+        page.run()
+    else:
+        page.run(Config, parameter, info_text)
@@ -1,12 +1,14 @@
 import streamlit as st
 
-from utils.observation import Observation
+from utils.cache import get_preview_batch
 from utils.configuration import (
     Configuration,
+    apply_changes,
     bool_to_numeric,
     get_distribution,
     show_linear_basis,
     show_linear_basis_observation,
+    sidebar_form,
 )
 from utils.plot import plot_multiple_observations
 from utils.load import get_image
@@ -16,6 +18,7 @@ def run(Config: Configuration, parameter: dict, info_text: dict) -> None:
     """Function to run the menu page "Anormal" that consists of a sidebar and the main page."""
     # display sidebar
     anormal_sb(Config, parameter, info_text)
+    apply_changes(Config)
     # display page
     anormal(Config, parameter, info_text)
 
@@ -23,18 +26,19 @@ def run(Config: Configuration, parameter: dict, info_text: dict) -> None:
 def anormal_sb(Config: Configuration, parameter: dict, info_text: dict) -> None:
     # display static sidebar subheader
     st.sidebar.subheader("Settings for the Anormal Observations (nOK)")
-    # SIDEBAR 1st EXPANDER
-    with st.sidebar.expander("Anomaly Type 1: Leap in the Tightening Phase"):
-        anormal_sb_type_1(Config, parameter, info_text)
-    # SIDEBAR 2nd EXPANDER
-    with st.sidebar.expander("Anomaly Type 2: Leap during the Final Tightening"):
-        anormal_sb_type_2(Config, parameter, info_text)
-    # SIDEBAR 3rd EXPANDER
-    with st.sidebar.expander("Anomaly Type 3: Hard Screw Run with Steeper Slope"):
-        anormal_sb_type_3(Config, parameter, info_text)
-    # SIDEBAR 4th EXPANDER
-    with st.sidebar.expander("Anomaly Type 4: Soft Screw Run with Flatter Slope"):
-        anormal_sb_type_4(Config, parameter, info_text)
+    with sidebar_form("anormal_sb"):
+        # SIDEBAR 1st EXPANDER
+        with st.expander("Anomaly Type 1: Leap in the Tightening Phase"):
+            anormal_sb_type_1(Config, parameter, info_text)
+        # SIDEBAR 2nd EXPANDER
+        with st.expander("Anomaly Type 2: Leap during the Final Tightening"):
+            anormal_sb_type_2(Config, parameter, info_text)
+        # SIDEBAR 3rd EXPANDER
+        with st.expander("Anomaly Type 3: Hard Screw Run with Steeper Slope"):
+            anormal_sb_type_3(Config, parameter, info_text)
+        # SIDEBAR 4th EXPANDER
+        with st.expander("Anomaly Type 4: Soft Screw Run with Flatter Slope"):
+            anormal_sb_type_4(Config, parameter, info_text)
     # show linear basis
     show_linear_basis(Config)
     show_linear_basis_observation(Config)
@@ -564,9 +568,13 @@ def plot_anomaly_type_1(Config: Configuration):
     st.subheader(
         f"Visualization of a Subset of Type 1 Anomalies: _Leap in the Tightening Phase_"
     )
-    Obs_type_1 = []
-    for _ in range(int(Config.anomaly_type_1_generate_amount_to_plot)):
-        Obs_type_1.append(Observation(Config, obs_type="anomaly_type_01"))
+    Obs_type_1 = [
+        get_preview_batch(
+            Config,
+            "anomaly_type_01",
+            int(Config.anomaly_type_1_generate_amount_to_plot),
+        )
+    ]
     plot_multiple_observations(
         observations=Obs_type_1,
         Config=Config,
@@ -578,9 +586,13 @@ def plot_anomaly_type_2(Config: Configuration):
     st.subheader(
         "Visualization of a Subset of Type 2 Anomalies: _Leap during the Final Tightening_"
     )
-    Obs_type_2 = []
-    for _ in range(int(Config.anomaly_type_2_generate_amount_to_plot)):
-        Obs_type_2.append(Observation(Config, obs_type="anomaly_type_02"))
+    Obs_type_2 = [
+        get_preview_batch(
+            Config,
+            "anomaly_type_02",
+            int(Config.anomaly_type_2_generate_amount_to_plot),
+        )
+    ]
     plot_multiple_observations(
         observations=Obs_type_2,
         Config=Config,
@@ -592,9 +604,13 @@ def plot_anomaly_type_3(Config: Configuration):
     st.subheader(
         "Visualization of a Subset of Type 3 Anomalies: _Hard Screw Run with Steeper Slope_"
     )
-    Obs_type_3 = []
-    for _ in range(int(Config.anomaly_type_3_generate_amount_to_plot)):
-        Obs_type_3.append(Observation(Config, obs_type="anomaly_type_03"))
+    Obs_type_3 = [
+        get_preview_batch(
+            Config,
+            "anomaly_type_03",
+            int(Config.anomaly_type_3_generate_amount_to_plot),
+        )
+    ]
     plot_multiple_observations(
         observations=Obs_type_3,
         Config=Config,
@@ -607,9 +623,13 @@ def plot_anomaly_type_4(Config: Configuration):
     st.subheader(
         "Visualization of a Subset of Type 4 Anomalies: _Softer Screw Run with Flatter Slope_"
     )
-    Obs_type_4 = []
-    for _ in range(int(Config.anomaly_type_4_generate_amount_to_plot)):
-        Obs_type_4.append(Observation(Config, obs_type="anomaly_type_04"))
+    Obs_type_4 = [
+        get_preview_batch(
+            Config,
+            "anomaly_type_04",
+            int(Config.anomaly_type_4_generate_amount_to_plot),
+        )
+    ]
     plot_multiple_observations(
         observations=Obs_type_4,
         Config=Config,
@@ -3,10 +3,12 @@ import streamlit as st
 from utils.observation import Observation
 from utils.configuration import (
     Configuration,
+    apply_changes,
     get_distribution,
     bool_to_numeric,
     show_linear_basis,
     show_linear_basis_observation,
+    sidebar_form,
     update_config,
 )
 from utils.plot import plot_single_observation
@@ -17,6 +19,7 @@ def run(Config: Configuration, parameter: dict, info_text: dict) -> None:
 
     # display sidebar
     baseline_sb(Config, parameter, info_text)
+    apply_changes(Config)
 
     # create new observation according to the selected Configuration
     Baseline = Observation(Config, obs_type="baseline")
@@ -47,34 +50,32 @@ def baseline_sb(Config: Configuration, parameter: dict, info_text: dict) -> None
     # display subheader for baseline
     st.sidebar.subheader("Preference Selection for Parameter for the Baseline")
 
-    # 1st Sidebar Expander
-    with st.sidebar.expander(
-        "Adjust the values of the Points used as the Linear Basis"
-    ):
-        baseline_sb_linear_basis(Config, parameter, info_text)
-
-    # 2nd Sidebar Expander
+    # buttons can not be part of a form, so points are added or removed directly
     with st.sidebar.expander("Adjust the Linear Basis by adding or removing Points"):
         baseline_sb_change_number_of_points(Config)
 
-    # 3rd Sidebar Expander
-    with st.sidebar.expander("Adjust the Function for Smoothing the Screw Runs"):
-        baseline_sb_smoothing_parameter(Config, parameter, info_text)
+    # all other parameter are applied together
+    with sidebar_form("baseline_sb"):
+        # 1st Sidebar Expander
+        with st.expander("Adjust the values of the Points used as the Linear Basis"):
+            baseline_sb_linear_basis(Config, parameter, info_text)
+
+        # 2nd Sidebar Expander
+        with st.expander("Adjust the Function for Smoothing the Screw Runs"):
+            baseline_sb_smoothing_parameter(Config, parameter, info_text)
 
-    # 4th Sidebar Expander
-    with st.sidebar.expander(
-        "Adjust the Scattering to apply Noise to the entire Screw Run"
-    ):
-        baseline_sb_scattering_for_entire_run(Config, parameter, info_text)
+        # 3rd Sidebar Expander
+        with st.expander(
+            "Adjust the Scattering to apply Noise to the entire Screw Run"
+        ):
+            baseline_sb_scattering_for_entire_run(Config, parameter, info_text)
 
-    # 5th Sidebar Expander
-    with st.sidebar.expander(
-        "Adjust the additional Scattering during the Tighening Phase"
-    ):
-        baseline_sb_scattering_for_tighening_phase(Config, parameter, info_text)
+        # 4th Sidebar Expander
+        with st.expander("Adjust the additional Scattering during the Tighening Phase"):
+            baseline_sb_scattering_for_tighening_phase(Config, parameter, info_text)
 
-    # remove negative values
-    remove_neg_y_values(Config)
+        # remove negative values
+        remove_neg_y_values(Config)
     # show linear basis
     show_linear_basis(Config)
 
@@ -330,7 +331,7 @@ def baseline_sb_scattering_for_tighening_phase(
 def remove_neg_y_values(Config: Configuration) -> None:
     """Simple checkbox to determine if negative y values are to be removed"""
     Config.remove_neg_y_values = bool_to_numeric(
-        st.sidebar.checkbox(
+        st.checkbox(
             label="Set negative y-values to zero", value=Config.remove_neg_y_values
         )
     )
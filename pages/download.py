@@ -1,10 +1,14 @@
 import streamlit as st
-import pandas as pd
 
-from utils.configuration import Configuration
-from utils.observation import Observation
+from io import BytesIO
+from typing import Tuple
+from utils.configuration import Configuration, update_config
+from utils.export import write_csv
+from utils.generation import OBS_TYPES, get_amount, iter_observation_chunks_threaded
+from utils.cache import get_preview_batch
 from utils.load import get_image
-from utils.plot import plot_multiple_observations
+from utils.plot import plot_multiple_observations, plot_percentiles
+from utils.progress import Progress, ProgressReporter
 
 
 def run(Config: Configuration, parameter: dict, info_text: dict) -> None:
@@ -13,6 +17,8 @@ def run(Config: Configuration, parameter: dict, info_text: dict) -> None:
     download_sb(Config, parameter, info_text)
     # display 'download' page
     download(Config, parameter, info_text)
+    # update the config file
+    update_config(Config)
 
 
 def download_sb(
@@ -24,6 +30,18 @@ def download_sb(
     st.sidebar.subheader("Settings for the Download")
     st.sidebar.write("Side bar Download")
 
+    # seed of the random generation to reproduce a data set
+    Config.seed = int(
+        st.sidebar.number_input(
+            label="Seed of the random generation",
+            min_value=parameter["generation"]["seed_min"],
+            max_value=parameter["generation"]["seed_max"],
+            value=int(Config.seed),
+            step=1,
+            help=info_text["generation"]["seed_tt"],
+        )
+    )
+
 
 def download(
     Config: Configuration,
@@ -88,17 +106,18 @@ def download_summary(Config: Configuration) -> None:
         delta_color="inverse",
     )
 
-    Obs_preview = []
-    for _ in range(int(Config.number_of_ok_to_plot)):
-        Obs_preview.append(Observation(Config, obs_type="ok"))
-    for _ in range(int(Config.anomaly_type_1_generate_amount_to_plot)):
-        Obs_preview.append(Observation(Config, obs_type="anomaly_type_01"))
-    for _ in range(int(Config.anomaly_type_2_generate_amount_to_plot)):
-        Obs_preview.append(Observation(Config, obs_type="anomaly_type_02"))
-    for _ in range(int(Config.anomaly_type_3_generate_amount_to_plot)):
-        Obs_preview.append(Observation(Config, obs_type="anomaly_type_03"))
-    for _ in range(int(Config.anomaly_type_4_generate_amount_to_plot)):
-        Obs_preview.append(Observation(Config, obs_type="anomaly_type_04"))
+    # get (cached) previews of all types of observations
+    amounts_to_plot = [
+        Config.number_of_ok_to_plot,
+        Config.anomaly_type_1_generate_amount_to_plot,
+        Config.anomaly_type_2_generate_amount_to_plot,
+        Config.anomaly_type_3_generate_amount_to_plot,
+        Config.anomaly_type_4_generate_amount_to_plot,
+    ]
+    Obs_preview = [
+        get_preview_batch(Config, obs_type, int(amount))
+        for obs_type, amount in zip(OBS_TYPES, amounts_to_plot)
+    ]
 
     plot_multiple_observations(
         observations=Obs_preview,
@@ -111,79 +130,53 @@ def download_summary(Config: Configuration) -> None:
 #type_3={int(Config.anomaly_type_3_generate_amount_to_plot)}; \
 #type_4={int(Config.anomaly_type_4_generate_amount_to_plot)})",
     )
+    with st.expander("Percentile bands of all types of observations"):
+        plot_percentiles(
+            observations=Obs_preview,
+            Config=Config,
+            plot_title="Median, 25-75% and 5-95% percentiles of the torque",
+        )
 
 
 def download_execute(Config: Configuration) -> None:
     """Function to execute the generation of screw data and to download it."""
     st.subheader("Generate the data set according to the current parameter selection")
 
-    @st.cache
-    def convert_df(df):
-        return df.to_csv().encode("utf-8")
-
-    df = pd.DataFrame([0, 1, 2, 3])  # dummy...
+    data = ""  # dummy...
 
     disable_download = True
     if st.button(label="Generate Screw Data"):
-        df, disable_download = generate_data(Config)
+        data, disable_download = generate_data(Config)
 
     st.download_button(
         label="Download Data",
-        data=convert_df(df),
+        data=data,
         file_name="screw_data.csv",
         mime="text/csv",
         disabled=disable_download,
     )
 
 
-def generate_data(Config: Configuration):
-    # get individual type count from Config file
-    count_normal = Config.number_of_ok
-    count_type_1 = Config.anomaly_type_1_generate_amount
-    count_type_2 = Config.anomaly_type_2_generate_amount
-    count_type_3 = Config.anomaly_type_3_generate_amount
-    count_type_4 = Config.anomaly_type_4_generate_amount
-    # # list all counts for iteration
-    amounts_listed = [
-        count_normal,
-        count_type_1,
-        count_type_2,
-        count_type_3,
-        count_type_4,
-    ]
-    # create list to add up counts for iteration and simply add them up
-    amounts_limits = [0]
-    for i in range(5):
-        amounts_limits.append(amounts_limits[i] + amounts_listed[i])
-    # get sum of all amounts
-    amounts_counted = sum(amounts_listed)
+def generate_data(Config: Configuration) -> Tuple[BytesIO, bool]:
+    # get sum of all amounts from Config file
+    amounts_counted = sum(get_amount(Config, obs_type) for obs_type in OBS_TYPES)
 
     # loop over amounts in spinner
     with st.spinner(f"Calculating paths for {amounts_counted} screw runs..."):
-        # initialize progress bar
+        # initialize progress bar and the line for throughput and ETA
         bar = st.progress(0)
+        status = st.empty()
+
+        def show_progress(progress: Progress) -> None:
+            bar.progress(int(progress.fraction * 100))
+            status.text(str(progress))
+
+        # generate the observations chunk by chunk in threads and write them to csv
+        buffer = BytesIO()
+        chunks = iter_observation_chunks_threaded(Config)
+        with ProgressReporter(amounts_counted, show_progress) as progress:
+            write_csv(chunks, buffer, progress)
 
-        # create emply list for observations
-        df_as_list = []  # temporary... TODO: switch to dataframe format
-
-        # iterate over total number of OK observations
-        for idx in range(amounts_counted):
-            # update the progress bar accordingly
-            bar.progress(int((idx + 1) * (100 / (amounts_counted))))
-            # get obs type
-            obs_types = [
-                "ok",
-                "anomaly_type_1",
-                "anomaly_type_2",
-                "anomaly_type_3",
-                "anomaly_type_4",
-            ]
-            # loop ofer obs types
-            for i in range(5):
-                if amounts_limits[i] <= 0 < amounts_limits[i + 1]:
-                    obs_type = obs_types[i]
-            # append value for the current obs type
-            df_as_list.append(Observation(Config, obs_type=obs_type))
-
-    # simple temp return for app testing
-    return pd.DataFrame([0, 1, 2, 3, 4, 5, 6, 7, 8, 9]), False
+    # the buffer is passed to the download button without another copy
+    buffer.seek(0)
+    return buffer, False
@@ -1,12 +1,15 @@
 import streamlit as st
 
-from utils.observation import Observation
+from utils.cache import get_preview_batch
+from utils.observation import ObservationBatch
 from utils.configuration import (
     Configuration,
+    apply_changes,
     get_distribution,
     bool_to_numeric,
     show_linear_basis,
     show_linear_basis_observation,
+    sidebar_form,
     update_config,
 )
 from utils.plot import plot_multiple_observations
@@ -17,11 +20,10 @@ def run(Config: Configuration, parameter: dict, info_text: dict) -> None:
 
     # display sidebar
     normal_sb(Config, parameter, info_text)
+    apply_changes(Config)
 
-    # create a group of new OK observations according to the Configuration
-    Obs = []
-    for _ in range(int(Config.number_of_ok_to_plot)):
-        Obs.append(Observation(Config, obs_type="obs"))
+    # get a (cached) group of OK observations according to the Configuration
+    Obs = [get_preview_batch(Config, "ok", int(Config.number_of_ok_to_plot))]
 
     # display 'normal' page
     normal(Obs, Config, info_text)
@@ -34,17 +36,16 @@ def normal_sb(Config: Configuration, parameter: dict, info_text: dict) -> None:
 
     st.sidebar.subheader("Settings for the Normal Observations (OK)")
 
-    # SIDEBAR 1st EXPANDER
-    with st.sidebar.expander("Adjust the total number of OK observations:"):
-        normal_sb_amount(Config, parameter, info_text)
-    # SIDEBAR 2nd EXPANDER
-    with st.sidebar.expander(
-        "Adjust the horizontal offset to randomize observations: ⇔"
-    ):
-        normal_sb_horizontal(Config, parameter, info_text)
-    # SIDEBAR 3rd EXPANDER
-    with st.sidebar.expander("Adjust the vertial offset to randomize observations: ⇕"):
-        normal_sb_vertical(Config, parameter, info_text)
+    with sidebar_form("normal_sb"):
+        # SIDEBAR 1st EXPANDER
+        with st.expander("Adjust the total number of OK observations:"):
+            normal_sb_amount(Config, parameter, info_text)
+        # SIDEBAR 2nd EXPANDER
+        with st.expander("Adjust the horizontal offset to randomize observations: ⇔"):
+            normal_sb_horizontal(Config, parameter, info_text)
+        # SIDEBAR 3rd EXPANDER
+        with st.expander("Adjust the vertial offset to randomize observations: ⇕"):
+            normal_sb_vertical(Config, parameter, info_text)
 
     # show linear basis
     show_linear_basis(Config)
@@ -187,7 +188,7 @@ def normal_sb_vertical(Config: Configuration, parameter: dict, info_text: dict)
 
 
 def normal(
-    observations: "list[Observation]", Config: Configuration, info_text: dict
+    observations: "list[ObservationBatch]", Config: Configuration, info_text: dict
 ) -> None:
     """Visualises the current Configuration on the normal page using the selected count of observations to display.
 
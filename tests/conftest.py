@@ -0,0 +1,23 @@
+import sys
+
+from pathlib import Path
+
+import pytest
+import toml
+
+# the modules of the app are imported relative to the root of the repository
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.configuration import Configuration
+
+
+@pytest.fixture
+def parameter() -> dict:
+    """Default parameter of the app (config/parameter.toml)."""
+    return toml.load(Path(__file__).parent.parent / "config" / "parameter.toml")
+
+
+@pytest.fixture
+def Config(parameter: dict) -> Configuration:
+    """Configuration with the default parameter."""
+    return Configuration(parameter)
@@ -0,0 +1,41 @@
+import numpy as np
+
+from utils.cache import get_preview_batch, preview_cache
+from utils.configuration import Configuration
+from utils.generation import generate_observations
+
+
+def test_preview_pool_grows_in_place(Config: Configuration):
+    preview_cache.clear()
+    (expected,) = generate_observations(Config, "anomaly_type_02", 40)
+    batches, capacity = [], []
+    for n in (3, 4, 17, 40):
+        batches.append(get_preview_batch(Config, "anomaly_type_02", n))
+        pool = preview_cache.get(
+            (Config.snapshot().preview_fingerprint, "anomaly_type_02")
+        )
+        capacity.append(len(pool.index))
+    # the rows are doubled if they do not suffice for the request
+    assert capacity == [3, 6, 17, 40]
+    for batch in batches + [get_preview_batch(Config, "anomaly_type_02", 10)]:
+        n = len(batch)
+        head = expected.head(n)
+        np.testing.assert_array_equal(batch.index, np.arange(n))
+        np.testing.assert_array_equal(batch.x_values, head.x_values)
+        np.testing.assert_allclose(batch.y_values, head.y_values, atol=1e-6)
+    assert np.shares_memory(batches[-1].y_values, pool.y_values)
+
+
+def test_preview_pool_ignores_the_amounts(Config: Configuration):
+    preview_cache.clear()
+    batch = get_preview_batch(Config, "ok", 5)
+    fingerprint = Config.snapshot().fingerprint
+    Config.number_of_ok += 100
+    Config.anomaly_type_3_generate_amount += 10
+    assert Config.snapshot().fingerprint != fingerprint
+    # the same pool is used, nothing is generated again
+    assert np.shares_memory(get_preview_batch(Config, "ok", 5).y_values, batch.y_values)
+    Config.seed += 1
+    assert not np.shares_memory(
+        get_preview_batch(Config, "ok", 5).y_values, batch.y_values
+    )
@@ -0,0 +1,66 @@
+import copy
+import pickle
+import sys
+import types
+
+import pytest
+import toml
+
+from utils import configuration
+from utils.configuration import Configuration, ConfigurationSnapshot
+
+
+def test_snapshot_pickle_round_trip(Config: Configuration):
+    snapshot = Config.snapshot()
+    restored = pickle.loads(pickle.dumps(snapshot))
+    assert restored == snapshot
+    assert restored.fingerprint == snapshot.fingerprint
+    assert restored.to_json() == snapshot.to_json()
+
+
+def test_snapshot_copy(Config: Configuration):
+    snapshot = Config.snapshot()
+    assert copy.copy(snapshot) == snapshot
+    assert copy.deepcopy(snapshot) == snapshot
+
+
+def test_snapshot_keeps_ints_in_toml(Config: Configuration):
+    Config.seed = 42
+    values = toml.loads(Config.export_config())
+    assert values["seed"] == 42
+    assert isinstance(values["seed"], int)
+
+
+def test_fingerprint_ignores_int_float_and_visualization(Config: Configuration):
+    snapshot = Config.snapshot()
+    values = dict(snapshot.values)
+    values["seed"] = float(values["seed"])
+    values["show_linear_basis"] = 1 - values["show_linear_basis"]
+    other = ConfigurationSnapshot(values)
+    assert other.fingerprint == snapshot.fingerprint
+    Config.seed += 1
+    assert Config.snapshot().fingerprint != snapshot.fingerprint
+
+
+def test_apply_changes_only_delays_automatic_changes(
+    Config: Configuration, monkeypatch: pytest.MonkeyPatch
+):
+    session_state = {}
+    sleeps = []
+    streamlit = types.SimpleNamespace(session_state=session_state, empty=lambda: None)
+    monkeypatch.setitem(sys.modules, "streamlit", streamlit)
+    monkeypatch.setattr(configuration.time, "sleep", sleeps.append)
+
+    # the first run of a session is applied at once
+    session_state["auto_apply"] = True
+    configuration.apply_changes(Config)
+    # as well as a form submission and a rerun without a change
+    session_state["auto_apply"] = False
+    Config.seed = 1
+    configuration.apply_changes(Config)
+    session_state["auto_apply"] = True
+    configuration.apply_changes(Config)
+    assert sleeps == []
+    Config.seed = 2
+    configuration.apply_changes(Config)
+    assert sleeps == [configuration.AUTO_APPLY_DELAY]
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from scipy.ndimage import correlate1d
+from scipy.signal import savgol_filter
+
+from utils.filter import FFT_WINDOW_LENGTH, apply_savgol_edges, correlate
+
+
+@pytest.mark.parametrize(
+    "window_length", [5, FFT_WINDOW_LENGTH - 1, FFT_WINDOW_LENGTH, 64, 301]
+)
+@pytest.mark.parametrize("length", [40, 400])
+def test_correlate_matches_correlate1d(window_length: int, length: int):
+    rng = np.random.default_rng(0)
+    y_values = rng.normal(size=(3, length))
+    weights = rng.normal(size=window_length)
+    np.testing.assert_allclose(
+        correlate(y_values, weights),
+        correlate1d(y_values, weights, axis=1, mode="nearest"),
+        atol=1e-10,
+    )
+
+
+@pytest.mark.parametrize("window_length, polyorder", [(5, 2), (21, 9), (301, 3)])
+def test_savgol_edges_match_savgol_filter(window_length: int, polyorder: int):
+    rng = np.random.default_rng(0)
+    y_values = np.cumsum(rng.normal(size=(3, 700)), axis=1)
+    # only the edges of every run are replaced, the runs start and stop at different columns
+    start, stop = np.array([0, 10, 50]), np.array([700, 690, 50 + window_length])
+    y_filtered = np.zeros_like(y_values)
+    apply_savgol_edges(y_values, y_filtered, start, stop, window_length, polyorder)
+    half = window_length // 2
+    edges = np.r_[:half, -half:0]
+    for row in range(3):
+        run = y_values[row, start[row] : stop[row]]
+        expected = savgol_filter(run, window_length, polyorder)
+        filtered = y_filtered[row, start[row] : stop[row]]
+        np.testing.assert_allclose(filtered[edges], expected[edges], atol=1e-8)
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from io import BytesIO
+from utils.configuration import Configuration
+from utils.export import write_csv
+from utils.generation import (
+    OBS_TYPES,
+    SyntheticDataset,
+    generate_observation,
+    generate_observations,
+    iter_observation_chunks,
+    iter_observation_chunks_parallel,
+    iter_observation_chunks_threaded,
+)
+from utils.observation import ObservationBatch
+
+
+@pytest.fixture
+def SmallConfig(Config: Configuration) -> Configuration:
+    Config.number_of_ok = 7
+    Config.anomaly_type_1_generate_amount = 3
+    Config.anomaly_type_2_generate_amount = 4
+    Config.anomaly_type_3_generate_amount = 2
+    Config.anomaly_type_4_generate_amount = 5
+    return Config
+
+
+def get_run(batch: ObservationBatch, idx: int) -> "dict[int, float]":
+    """Returns the valid samples of a run as {x: y}."""
+    valid = ~np.isnan(batch.y_values[idx])
+    return dict(zip(batch.x_values[valid].tolist(), batch.y_values[idx, valid]))
+
+
+def assert_same_run(run: "dict[int, float]", expected: "dict[int, float]"):
+    assert run.keys() == expected.keys()
+    np.testing.assert_allclose(list(run.values()), list(expected.values()), atol=1e-6)
+
+
+@pytest.mark.parametrize("obs_type", OBS_TYPES)
+def test_random_access_matches_bulk(SmallConfig: Configuration, obs_type: str):
+    (batch,) = generate_observations(SmallConfig, obs_type, 6)
+    for index in range(len(batch)):
+        single = generate_observation(SmallConfig, obs_type, index)
+        assert_same_run(get_run(single, 0), get_run(batch, index))
+
+
+def test_dataset_matches_bulk(SmallConfig: Configuration):
+    dataset = SyntheticDataset(SmallConfig)
+    assert len(dataset) == 21
+    (batch,) = generate_observations(SmallConfig, "anomaly_type_02", 4)
+    # the anomalies of type 2 follow 7 ok and 3 type 1 observations
+    assert_same_run(get_run(dataset[12], 0), get_run(batch, 2))
+    assert_same_run(get_run(dataset[-1], 0), get_run(dataset[20], 0))
+
+
+def test_types_have_own_streams(SmallConfig: Configuration):
+    (before,) = generate_observations(SmallConfig, "anomaly_type_03", 2)
+    SmallConfig.number_of_ok = 50
+    SmallConfig.anomaly_type_1_generate_amount = 0
+    (after,) = generate_observations(SmallConfig, "anomaly_type_03", 2)
+    np.testing.assert_array_equal(before.y_values, after.y_values)
+    # the same index of another type is drawn from another stream
+    (ok,) = generate_observations(SmallConfig, "ok", 2)
+    assert not np.array_equal(ok.keypoints.x, after.keypoints.x)
+
+
+def test_chunk_engines_match_serial(SmallConfig: Configuration):
+    serial = [
+        (obs_type, batch.index, batch.x_values, batch.y_values)
+        for obs_type, batch in iter_observation_chunks(SmallConfig, chunk_size=3)
+    ]
+    threaded = [
+        (obs_type, batch.index, batch.x_values, batch.y_values)
+        for obs_type, batch in iter_observation_chunks_threaded(
+            SmallConfig, chunk_size=3, max_workers=2
+        )
+    ]
+    # the shared memory of a chunk is freed once the next one is requested
+    parallel = [
+        (obs_type, chunk.index, chunk.x_values, chunk.y_values.copy())
+        for obs_type, chunk in iter_observation_chunks_parallel(
+            SmallConfig, chunk_size=3, max_workers=2
+        )
+    ]
+    assert len(serial) == len(threaded) == len(parallel) == 9
+    for engine in (threaded, parallel):
+        for expected, chunk in zip(serial, engine):
+            assert chunk[0] == expected[0]
+            for values, expected_values in zip(chunk[1:], expected[1:]):
+                np.testing.assert_array_equal(values, expected_values)
+
+
+def test_parallel_csv_matches_serial(SmallConfig: Configuration):
+    serial, parallel = BytesIO(), BytesIO()
+    write_csv(iter_observation_chunks(SmallConfig, chunk_size=3), serial)
+    chunks = iter_observation_chunks_parallel(
+        SmallConfig, chunk_size=3, max_workers=2, format_csv=True
+    )
+    assert write_csv(chunks, parallel) == 21
+    assert parallel.getvalue() == serial.getvalue()
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from utils.configuration import Configuration
+from utils.observation import Observation, ObservationBatch
+
+FILTERS = [
+    ("Savitzky-Golay-Filter", 21),
+    ("Savitzky-Golay-Filter", 101),
+    ("Discrete Linear Convolution", None),
+]
+# default basis and a basis with a non-zero first point and a sloped last segment
+BASES = [{}, {"y0": 3.0, "y6": 30.0}]
+# type 1 is excluded: Observation returns one y value less than x values for its leap
+OBS_TYPES = ["ok", "anomaly_type_02", "anomaly_type_03", "anomaly_type_04"]
+
+
+def get_observation(
+    batch: ObservationBatch, idx: int, Config: Configuration
+) -> Observation:
+    """Returns the Observation with the same (random) keypoints as a run of the batch."""
+    Obs = Observation.__new__(Observation)
+    Obs.obs_type = batch.obs_type
+    Obs.x_steps = {f"x{i}": float(x) for i, x in enumerate(batch.keypoints.x[idx])}
+    Obs.y_steps = {f"y{i}": float(y) for i, y in enumerate(batch.keypoints.y[idx])}
+    Obs.y_values = Obs.get_y(Config)
+    Obs.x_values = Obs.get_x()
+    return Obs
+
+
+@pytest.mark.parametrize("filter_type, window_length", FILTERS)
+@pytest.mark.parametrize("obs_type", OBS_TYPES)
+@pytest.mark.parametrize("y_steps", BASES)
+def test_batch_matches_observation(
+    Config: Configuration,
+    filter_type: str,
+    window_length: int,
+    obs_type: str,
+    y_steps: "dict[str, float]",
+):
+    Config.y_steps.update(y_steps)
+    Config.filter_apply = 1
+    Config.filter_type_selected = filter_type
+    if window_length:
+        Config.filter_sg_window_length = window_length
+    # the noise of both implementations comes from different generators
+    Config.rnd_scattering_apply = 0
+    Config.rnd_tightening_apply = 0
+
+    batch = ObservationBatch(Config, obs_type, 20)
+    for idx in range(len(batch)):
+        Obs = get_observation(batch, idx, Config)
+        columns = np.array(Obs.x_values) - batch.x_values[0]
+        np.testing.assert_allclose(
+            batch.y_values[idx, columns], Obs.y_values, rtol=0, atol=1e-5
+        )
@@ -0,0 +1,32 @@
+from utils.configuration import Configuration
+from utils.export import write_csv
+from utils.generation import iter_observation_chunks
+from utils.progress import Progress, ProgressReporter
+
+
+class Stream:
+    """Write-only stream without seek and tell (e.g. stdout or a socket)."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self.data += data
+        return len(data)
+
+
+def test_write_csv_counts_written_bytes(Config: Configuration):
+    Config.number_of_ok = 5
+    Config.anomaly_type_1_generate_amount = 2
+    Config.anomaly_type_2_generate_amount = 0
+    Config.anomaly_type_3_generate_amount = 0
+    Config.anomaly_type_4_generate_amount = 3
+    reports = []
+    stream = Stream()
+    with ProgressReporter(10, reports.append, interval=0) as progress:
+        written = write_csv(
+            iter_observation_chunks(Config, chunk_size=2), stream, progress
+        )
+    assert written == 10
+    assert reports[-1] == Progress(10, 10, len(stream.data), reports[-1].elapsed)
+    assert reports[-1].fraction == 1.0
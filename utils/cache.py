@@ -0,0 +1,211 @@
+import numpy as np
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable
+from utils.configuration import Configuration
+from utils.generation import get_rng
+from utils.keypoints import Keypoints
+from utils.observation import ObservationBatch
+
+# maximum memory of all cached preview batches (in bytes)
+MAX_CACHE_BYTES = 256 * 1024**2
+
+
+def get_nbytes(value: Any) -> int:
+    """Returns the (approximate) memory of a cached value in bytes."""
+    if isinstance(value, ObservationBatch):
+        keypoints = value.keypoints
+        return value.y_values.nbytes + keypoints.x.nbytes + keypoints.y.nbytes
+    return int(getattr(value, "nbytes", 0))
+
+
+class LRUCache:
+    """Thread-safe cache that removes the least recently used values above a memory cap.
+
+    The cache is shared by all sessions of the app (process-wide), so the keys have to
+    contain everything the value depends on (e.g. the fingerprint of a Configuration).
+    Cached values are shared and must not be modified.
+    """
+
+    def __init__(self, max_bytes: int = MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.values = OrderedDict()
+        self.lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def get(self, key: Hashable) -> Any:
+        """Returns the value of the key (or None) and marks it as recently used."""
+        with self.lock:
+            if key not in self.values:
+                return None
+            self.values.move_to_end(key)
+            return self.values[key][0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Adds a value and removes the least recently used values above the memory cap."""
+        nbytes = get_nbytes(value)
+        with self.lock:
+            if key in self.values:
+                self.nbytes -= self.values.pop(key)[1]
+            # values larger than the cap are not cached at all
+            if nbytes > self.max_bytes:
+                return
+            self.values[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                self.nbytes -= self.values.popitem(last=False)[1][1]
+
+    def clear(self) -> None:
+        with self.lock:
+            self.values.clear()
+            self.nbytes = 0
+
+
+# process-wide cache of the preview batches of all pages
+preview_cache = LRUCache()
+
+
+class PreviewPool:
+    """Append-only pool of the observations of a type, preallocated in doubling blocks.
+
+    The runs are stored in arrays with spare rows. If they are full, the capacity is
+    doubled, so every run is copied only a constant number of times on average while
+    the pool grows.
+    The batches returned by head are views on the arrays.
+
+    Parameters
+    ----------
+    obs_type : str
+        Type of the observations (see utils.generation.OBS_TYPES).
+    """
+
+    def __init__(self, obs_type: str):
+        self.obs_type = obs_type
+        self.size = 0
+        self.index = np.zeros(0, np.int64)
+        self.keypoints = Keypoints(np.zeros((0, 0)), np.zeros((0, 0)))
+        # common grid of all rows, NaN outside of the range of every run
+        self.x_values = np.arange(0)
+        self.y_values = np.zeros((0, 0))
+        # sessions may extend and read the same pool at the same time
+        self.lock = Lock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        """Memory of the preallocated arrays in bytes."""
+        return (
+            self.index.nbytes
+            + self.keypoints.x.nbytes
+            + self.keypoints.y.nbytes
+            + self.y_values.nbytes
+        )
+
+    def reserve(self, rows: int, points: int, x_values: np.ndarray) -> None:
+        """Reallocates the arrays if the rows or the grid x_values do not fit."""
+        capacity = len(self.index)
+        first, last = int(x_values[0]), int(x_values[-1]) + 1
+        if self.size:
+            first = min(first, int(self.x_values[0]))
+            last = max(last, int(self.x_values[-1]) + 1)
+        grid = np.arange(first, last)
+        if rows <= capacity and np.array_equal(grid, self.x_values):
+            return
+        if rows > capacity:
+            capacity = max(rows, 2 * capacity)
+        size = self.size
+        index = np.zeros(capacity, np.int64)
+        x = np.zeros((capacity, points))
+        y = np.zeros((capacity, points))
+        y_values = np.full((capacity, len(grid)), np.nan)
+        if size:
+            index[:size] = self.index[:size]
+            x[:size] = self.keypoints.x[:size]
+            y[:size] = self.keypoints.y[:size]
+            column = int(self.x_values[0]) - first
+            y_values[:size, column : column + len(self.x_values)] = self.y_values[:size]
+        self.index = index
+        self.keypoints = Keypoints(x, y)
+        self.x_values = grid
+        self.y_values = y_values
+
+    def append(self, batch: ObservationBatch) -> None:
+        """Copies the runs of a batch to the end of the pool."""
+        if not len(batch):
+            return
+        stop = self.size + len(batch)
+        self.reserve(stop, batch.keypoints.points, batch.x_values)
+        self.index[self.size : stop] = batch.index
+        self.keypoints.x[self.size : stop] = batch.keypoints.x
+        self.keypoints.y[self.size : stop] = batch.keypoints.y
+        column = int(batch.x_values[0]) - int(self.x_values[0])
+        self.y_values[
+            self.size : stop, column : column + len(batch.x_values)
+        ] = batch.y_values
+        self.size = stop
+
+    def extend(self, Config: Configuration, n: int) -> None:
+        """Generates the missing runs, so the pool contains at least n observations."""
+        with self.lock:
+            if self.size >= n:
+                return
+            # every run only depends on its index, so the pool can be extended at the end
+            rng = get_rng(Config.seed, self.obs_type, np.arange(self.size, n))
+            self.append(ObservationBatch(Config, self.obs_type, n - self.size, rng=rng))
+
+    def head(self, n: int) -> ObservationBatch:
+        """Returns the first n runs as a batch of views on the pool."""
+        with self.lock:
+            keypoints = Keypoints(
+                self.keypoints.x[: self.size], self.keypoints.y[: self.size]
+            )
+            pool = ObservationBatch.from_arrays(
+                self.obs_type,
+                self.index[: self.size],
+                keypoints,
+                self.x_values,
+                self.y_values[: self.size],
+            )
+        return pool.head(n)
+
+
+def get_preview_batch(Config: Configuration, obs_type: str, n: int) -> ObservationBatch:
+    """Returns the first n observations of a type from a cached, append-only pool.
+
+    The pool is cached with the preview fingerprint of the Configuration (which
+    includes the seed but neither the visualization options nor the amounts to
+    generate), so reruns that only change how the observations are displayed or the
+    size of the dataset do not generate them again. If n grows, only the
+    missing runs are generated and appended to the preallocated rows of the pool
+    (see PreviewPool); if n shrinks, the pool is sliced.
+
+    Parameters
+    ----------
+    Config : Configuration
+        Details of the current configuration
+    obs_type : str
+        Type of the observations (see utils.generation.OBS_TYPES).
+    n : int
+        Number of observations to preview.
+
+    Returns
+    -------
+    ObservationBatch
+        View on the cached pool of observations, must not be modified.
+    """
+    n = int(n)
+    key = (Config.snapshot().preview_fingerprint, obs_type)
+    pool = preview_cache.get(key)
+    if pool is None:
+        pool = PreviewPool(obs_type)
+    if len(pool) < n:
+        pool.extend(Config, n)
+        # the memory of the pool changed
+        preview_cache.put(key, pool)
+    return pool.head(n)
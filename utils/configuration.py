@@ -1,8 +1,18 @@
-from typing import Tuple
-from toml import dump, load
+import json
+import time
+
+from contextlib import contextmanager
+from copy import deepcopy
+from hashlib import sha256
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Tuple
+from toml import dump, dumps, load
 from pathlib import Path
 from utils.load import get_root
-from streamlit import selectbox, slider, sidebar, checkbox
+
+
+# time to wait for further changes before automatic changes are applied (in seconds)
+AUTO_APPLY_DELAY = 0.5
 
 
 class Configuration:
@@ -27,6 +37,9 @@ class Configuration:
         self.number_of_ok = parameter["amounts"]["number_of_ok_val"]
         self.number_of_ok_to_plot = parameter["amounts"]["number_of_ok_to_plot_val"]
 
+        # set default value for the seed of the random generation
+        self.seed = parameter["generation"]["seed_val"]
+
         # set default values for smoothing filter
         self.filter_apply = parameter["filter"]["apply"]
         self.filter_type_selected = parameter["filter"]["selected_type"]
@@ -242,8 +255,143 @@ class Configuration:
             "show_linear_basis_observation"
         ]
 
-    def export_config(self):
-        pass
+    def snapshot(self) -> "ConfigurationSnapshot":
+        """Returns an immutable copy of the current values of all parameters."""
+        return ConfigurationSnapshot(vars(self))
+
+    def export_config(self) -> str:
+        """Returns all parameters of the configuration as canonical toml."""
+        return self.snapshot().to_toml()
+
+
+class ConfigurationSnapshot:
+    """Immutable and hashable copy of the parameters of a Configuration.
+
+    The values keep their types (ints stay ints in the json and toml). For the
+    comparison, the hash and the fingerprint they are used in a canonical form
+    (numbers as float, keys sorted), so two snapshots with the same parameters are
+    equal even if the widgets switched between int and float. The fingerprint ignores
+    the fields in VISUALIZATION_FIELDS, which do not change the generated data, so it
+    can be used as key for caches and manifests. The preview fingerprint additionally
+    ignores the AMOUNT_FIELDS: every run only depends on the seed, its type and its
+    index, so the previews stay valid if the size of the dataset changes. Snapshots
+    can be pickled, e.g. to pass them to worker processes.
+    """
+
+    __slots__ = ("_values", "_json", "_canonical", "_fingerprint", "_preview")
+
+    def __init__(self, values: Dict[str, Any]):
+        frozen = {key: get_frozen(value) for key, value in values.items()}
+        object.__setattr__(self, "_values", MappingProxyType(frozen))
+        object.__setattr__(
+            self, "_json", json.dumps(frozen, sort_keys=True, default=dict)
+        )
+        canonical = {key: get_canonical(value) for key, value in frozen.items()}
+        object.__setattr__(self, "_canonical", json.dumps(canonical, sort_keys=True))
+        fingerprint = get_fingerprint(canonical, VISUALIZATION_FIELDS)
+        object.__setattr__(self, "_fingerprint", fingerprint)
+        preview = get_fingerprint(canonical, VISUALIZATION_FIELDS + AMOUNT_FIELDS)
+        object.__setattr__(self, "_preview", preview)
+
+    def __reduce__(self) -> Tuple[type, Tuple[Dict[str, Any]]]:
+        return ConfigurationSnapshot, (json.loads(self._json),)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("ConfigurationSnapshot is immutable")
+
+    def __getattr__(self, name: str) -> Any:
+        # private names are slots, they are only looked up here if not set (yet)
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ConfigurationSnapshot):
+            return NotImplemented
+        return self._canonical == other._canonical
+
+    def __hash__(self) -> int:
+        return hash(self._canonical)
+
+    def __repr__(self) -> str:
+        return f"ConfigurationSnapshot({self._fingerprint[:12]})"
+
+    @property
+    def values(self) -> "MappingProxyType[str, Any]":
+        """Read-only mapping of all parameters."""
+        return self._values
+
+    @property
+    def fingerprint(self) -> str:
+        """sha256 of all parameters that change the generated data."""
+        return self._fingerprint
+
+    @property
+    def preview_fingerprint(self) -> str:
+        """sha256 of all parameters that change the runs (but not their number)."""
+        return self._preview
+
+    def to_json(self) -> str:
+        """Returns the json of all parameters (with sorted keys)."""
+        return self._json
+
+    def to_toml(self) -> str:
+        """Returns all parameters as toml (with sorted keys)."""
+        return dumps(json.loads(self._json))
+
+
+# parameters that only change the visualization, not the generated data
+VISUALIZATION_FIELDS = (
+    "number_of_ok_to_plot",
+    "anomaly_type_1_generate_amount_to_plot",
+    "anomaly_type_2_generate_amount_to_plot",
+    "anomaly_type_3_generate_amount_to_plot",
+    "anomaly_type_4_generate_amount_to_plot",
+    "show_linear_basis",
+    "show_linear_basis_observation",
+)
+# parameters that only change the number of generated runs per type
+AMOUNT_FIELDS = (
+    "number_of_ok",
+    "anomaly_type_1_generate_amount",
+    "anomaly_type_2_generate_amount",
+    "anomaly_type_3_generate_amount",
+    "anomaly_type_4_generate_amount",
+)
+
+
+def get_fingerprint(canonical: Dict[str, Any], exclude: Tuple[str, ...]) -> str:
+    """Returns the sha256 of the canonical parameters without the excluded fields."""
+    data = {k: v for k, v in canonical.items() if k not in exclude}
+    return sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def get_frozen(value: Any) -> Any:
+    """Returns an immutable copy of a parameter value (tuples and read-only dicts)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(get_frozen(v) for v in value)
+    if isinstance(value, dict):
+        return MappingProxyType({k: get_frozen(v) for k, v in value.items()})
+    return value
+
+
+def get_canonical(value: Any) -> Any:
+    """Returns the canonical form of a parameter value for comparisons and hashes.
+
+    Numbers (and bools) are converted to float, since the widgets and the toml files
+    switch between int and float. Tuples become lists and mappings dicts (the keys are
+    sorted when the values are serialized).
+    """
+    if isinstance(value, (bool, int, float)):
+        return float(value)
+    if isinstance(value, (list, tuple)):
+        return [get_canonical(v) for v in value]
+    if isinstance(value, (dict, MappingProxyType)):
+        return {k: get_canonical(v) for k, v in value.items()}
+    return value
 
 
 def get_distribution(
@@ -273,6 +421,9 @@ def get_distribution(
     weibull_alpha : float
         Alpha value for weibull distribution
     """
+    # import streamlit only for the interface (not for the headless generation)
+    from streamlit import selectbox, slider
+
     # initialize with default values
     selected_type = default_parameter["selected_type"]
     normal_stadev = default_parameter["normal_stadev_val"]
@@ -329,6 +480,8 @@ def bool_to_numeric(val: bool) -> int:
 
 def show_linear_basis(Config: Configuration) -> None:
     """Simple checkbox to toggle visualization of linear basis of the baseline"""
+    from streamlit import sidebar
+
     Config.show_linear_basis = bool_to_numeric(
         sidebar.checkbox(
             "Display the linear basis according to the Baseline",
@@ -339,17 +492,77 @@ def show_linear_basis(Config: Configuration) -> None:
 
 def show_linear_basis_observation(Config: Configuration) -> None:
     """Simple checkbox to toggle visualization of linear basis of each anomaly"""
+    from streamlit import sidebar
+
     Config.show_linear_basis_observation = bool_to_numeric(
         sidebar.checkbox(
-            "Display the linear basis for every Screw Run (slow)",
+            "Display the linear basis for every Screw Run",
             value=Config.show_linear_basis_observation,
         )
     )
 
 
+@contextmanager
+def sidebar_form(key: str) -> Iterator[None]:
+    """Groups the sidebar widgets of a page in a form that is applied by a button.
+
+    Changes of the widgets in a form do not rerun the page, so any number of changes
+    only triggers a single generation. If the changes are applied automatically (see
+    auto_apply), the widgets are placed in a plain container instead.
+
+    Parameters
+    ---
+    key : str
+        Unique key of the form
+    """
+    from streamlit import form_submit_button, session_state, sidebar
+
+    if session_state.get("auto_apply", False):
+        with sidebar.container():
+            yield
+    else:
+        with sidebar.form(key=key):
+            yield
+            form_submit_button("Apply the Settings")
+
+
+def auto_apply() -> None:
+    """Simple checkbox to apply the changes of the settings without a button"""
+    from streamlit import sidebar
+
+    sidebar.checkbox(
+        "Apply changes automatically",
+        value=False,
+        key="auto_apply",
+        help="Regenerates the observations after every change (with a short delay)",
+    )
+
+
+def apply_changes(Config: Configuration) -> None:
+    """Debounces the automatic changes of the settings before a page generates data.
+
+    Only if the changes are applied automatically and a setting has changed since the
+    last run, the page waits for AUTO_APPLY_DELAY seconds. Every further change during
+    this time reruns the page, so the outdated run is stopped (at its next element)
+    before it generates any data. Form submissions, the first run of a session and
+    reruns without any change are not delayed.
+    """
+    from streamlit import empty, session_state
+
+    fingerprint = Config.snapshot().fingerprint
+    previous = session_state.get("applied_fingerprint")
+    if session_state.get("auto_apply", False) and previous not in (None, fingerprint):
+        time.sleep(AUTO_APPLY_DELAY)
+        # streamlit stops the run here if another change was made in the meantime
+        empty()
+    session_state["applied_fingerprint"] = fingerprint
+
+
 def update_config(Config: Configuration) -> None:
 
     parameter = load(Path(get_root()) / "config//parameter.toml")
+    # keep the loaded parameter to skip writing an unchanged file
+    loaded = deepcopy(parameter)
     # Modify field
     parameter["base"]["init_x"] = list(Config.x_steps.values())
     parameter["base"]["init_y"] = list(Config.y_steps.values())
@@ -373,6 +586,9 @@ def update_config(Config: Configuration) -> None:
     parameter["amounts"]["number_of_ok"] = Config.number_of_ok
     parameter["amounts"]["number_of_ok_to_plot"] = Config.number_of_ok_to_plot
 
+    # update default value for the seed of the random generation
+    parameter["generation"]["seed_val"] = Config.seed
+
     # update default values for smoothing filter
     parameter["filter"]["apply"] = Config.filter_apply
     parameter["filter"]["selected_type"] = Config.filter_type_selected
@@ -459,6 +675,8 @@ def update_config(Config: Configuration) -> None:
     # update default values for visualizations
     parameter["visualization"]["show_linear_basis"] = Config.show_linear_basis
 
+    if parameter == loaded:
+        return
     # To use the dump function, you need to open the file in 'write' mode
     # It did not work if I just specify file location like in load
     f = open(Path(get_root()) / "config//parameter.toml", "w")
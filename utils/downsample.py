@@ -0,0 +1,121 @@
+import numpy as np
+
+# default number of points per run that is sent to the browser
+MAX_PLOT_POINTS = 1000
+
+
+def lttb(x_values: np.ndarray, y_values: np.ndarray, n_out: int) -> np.ndarray:
+    """Selects n_out points of every run using Largest-Triangle-Three-Buckets.
+
+    The first and the last point are always kept, the points in between are split
+    into n_out - 2 buckets. From every bucket the point is selected that forms the
+    largest triangle with the point selected before and the average of the next
+    bucket. The buckets are processed one after another, but every step is applied
+    to all runs at once.
+
+    Parameters
+    ----------
+    x_values : np.ndarray
+        Increasing x values (rotation angles) shared by all runs.
+    y_values : np.ndarray
+        Array of shape (runs, len(x_values)) without NaN.
+    n_out : int
+        Number of points to select per run (at least 3).
+
+    Returns
+    -------
+    np.ndarray
+        Increasing indices of the selected points of shape (runs, n_out).
+    """
+    runs, length = y_values.shape
+    if n_out >= length or n_out < 3:
+        return np.tile(np.arange(length), (runs, 1))
+    x_values = np.asarray(x_values, float)
+    # bucket b contains the points edges[b] to edges[b + 1] - 1
+    edges = np.linspace(1, length - 1, n_out - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    # average of every bucket, followed by the last point as "next bucket" of the last
+    x_mean = np.append(np.add.reduceat(x_values[:-1], edges[:-1]) / sizes, x_values[-1])
+    y_mean = np.column_stack(
+        [np.add.reduceat(y_values[:, :-1], edges[:-1], axis=1) / sizes, y_values[:, -1]]
+    )
+
+    rows = np.arange(runs)
+    selected = np.zeros((runs, n_out), np.int64)
+    selected[:, -1] = length - 1
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        previous = selected[:, bucket]
+        x_a, y_a = x_values[previous], y_values[rows, previous]
+        x_c, y_c = x_mean[bucket + 1], y_mean[:, bucket + 1]
+        # twice the area of the triangles between a, every point b and c
+        x_b, y_b = x_values[start:stop], y_values[:, start:stop]
+        area = np.abs(
+            (x_a - x_c)[:, None] * (y_b - y_a[:, None])
+            - (x_a[:, None] - x_b) * (y_c - y_a)[:, None]
+        )
+        selected[:, bucket + 1] = start + np.argmax(area, axis=1)
+    return selected
+
+
+def get_plot_mask(
+    x_values: np.ndarray,
+    y_values: np.ndarray,
+    x_steps: np.ndarray,
+    max_points: "int | None" = MAX_PLOT_POINTS,
+) -> np.ndarray:
+    """Returns the points of every run to plot, reduced to about max_points per run.
+
+    The grid is split into max_points / 3 buckets. From every bucket the point selected
+    by lttb as well as the minimum and the maximum of the run are kept, so the leaps
+    of anomaly type 1 and 2 are never cut off. Additionally, the points at (and next
+    to) the keypoints of every run are kept. NaN values (outside the range of a run)
+    are never selected.
+
+    Parameters
+    ----------
+    x_values : np.ndarray
+        Grid of consecutive integer x values (rotation angles), shared by all runs.
+    y_values : np.ndarray
+        Array of shape (runs, len(x_values)), NaN outside of the range of a run.
+    x_steps : np.ndarray
+        x values of the keypoints of every run of shape (runs, points).
+    max_points : int or None
+        Budget of points per run, None or 0 to keep all points.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean mask with the same shape as y_values.
+    """
+    valid = ~np.isnan(y_values)
+    runs, length = y_values.shape
+    if not max_points or length <= max_points or not valid.any():
+        return valid
+    # repeat the first and last value of every run, so lttb works on the whole grid
+    first = np.argmax(valid, axis=1)
+    last = length - 1 - np.argmax(valid[:, ::-1], axis=1)
+    filled = np.take_along_axis(
+        y_values,
+        np.clip(np.arange(length), first[:, None], last[:, None]),
+        axis=1,
+    )
+    n_out = max(max_points // 3, 3)
+    mask = np.zeros((runs, length), bool)
+    rows = np.arange(runs)[:, None]
+    mask[rows, lttb(x_values, filled, n_out)] = True
+    # keep the extremes of every bucket, the shorter buckets repeat their last point
+    edges = np.linspace(0, length, n_out + 1).astype(np.int64)
+    index = edges[:-1, None] + np.arange(np.diff(edges).max())
+    index = np.minimum(index, edges[1:, None] - 1)
+    buckets = filled[:, index]
+    bucket = np.arange(n_out)
+    for extreme in (np.argmax, np.argmin):
+        mask[rows, index[bucket, extreme(buckets, axis=2)]] = True
+    mask[rows[:, 0], first] = True
+    mask[rows[:, 0], last] = True
+    # keep the keypoints and their neighbours
+    steps = np.round(np.atleast_2d(x_steps) - x_values[0]).astype(np.int64)
+    for offset in (-1, 0, 1):
+        mask[rows, np.clip(steps + offset, 0, length - 1)] = True
+    return mask & valid
@@ -0,0 +1,134 @@
+import numpy as np
+
+from typing import IO, Iterable, Tuple
+from utils.observation import ObservationBatch
+from utils.progress import ProgressReporter
+
+# columns of the exported data in long format (one row per sample)
+CSV_HEADER = "obs_type,run,angle,torque"
+# ASCII codes used to assemble the rows
+ZERO, MINUS = ord("0"), ord("-")
+
+
+def get_digits(values: np.ndarray, width: "int | None" = None) -> np.ndarray:
+    """Returns the decimal digits of non-negative integers as ASCII codes.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Non-negative integers (one per row).
+    width : int or None
+        Fixed number of digits (zero-padded), None for as many digits as needed.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (len(values), width) with dtype uint8. Without a fixed width,
+        the leading zeros are 0 bytes that are dropped when the rows are joined.
+    """
+    padded = width is not None
+    if not padded:
+        width = len(str(int(values.max()))) if values.size else 1
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    digits = ((values[:, None] // powers) % 10 + ZERO).astype(np.uint8)
+    if not padded:
+        digits[(values[:, None] < powers) & (powers > 1)] = 0
+    return digits
+
+
+def get_sign(negative: np.ndarray) -> np.ndarray:
+    """Returns a column with "-" for negative rows and a dropped 0 byte otherwise."""
+    return np.where(negative, MINUS, 0).astype(np.uint8)[:, None]
+
+
+def format_rows(
+    obs_type: str, run: np.ndarray, angle: np.ndarray, torque: np.ndarray
+) -> bytes:
+    """Formats the rows of a chunk like "obs_type,%d,%d,%.6f" in vectorized form.
+
+    All rows are assembled as one array of ASCII codes with a fixed width per column,
+    the unused positions are 0 bytes and removed at once. The torque is rounded to
+    integer micro units, so the output matches the printf formatting.
+    """
+    n = len(torque)
+
+    def get_text(text: str) -> np.ndarray:
+        return np.broadcast_to(
+            np.frombuffer(text.encode("ascii"), np.uint8), (n, len(text))
+        )
+
+    angle = angle.astype(np.int64)
+    micro = np.rint(np.abs(torque) * 1e6).astype(np.int64)
+    rows = np.hstack(
+        [
+            get_text(f"{obs_type},"),
+            get_digits(run.astype(np.int64)),
+            get_text(","),
+            get_sign(angle < 0),
+            get_digits(np.abs(angle)),
+            get_text(","),
+            get_sign(np.signbit(torque)),
+            get_digits(micro // 10**6),
+            get_text("."),
+            get_digits(micro % 10**6, width=6),
+            get_text("\n"),
+        ]
+    ).ravel()
+    return rows[rows != 0].tobytes()
+
+
+def format_chunk(obs_type: str, batch: ObservationBatch) -> bytes:
+    """Returns the csv rows of all samples of a chunk (without the header)."""
+    # skip the NaN values outside of the range of each observation
+    run, column = np.nonzero(~np.isnan(batch.y_values))
+    return format_rows(
+        obs_type,
+        batch.index[run],
+        batch.x_values[column],
+        batch.y_values[run, column],
+    )
+
+
+def write_csv(
+    chunks: Iterable[Tuple[str, ObservationBatch]],
+    file: IO[bytes],
+    progress: "ProgressReporter | None" = None,
+) -> int:
+    """Writes chunks of observations to a csv file in long format.
+
+    Every sample of a run becomes one row "obs_type,run,angle,torque", where run is
+    the index of the observation within its type. The chunks are formatted at once
+    and written one at a time, so the memory only depends on the size of a single
+    chunk. Chunks that were already formatted by a worker (see SharedChunk.csv) are
+    written as they are.
+
+    Parameters
+    ----------
+    chunks : Iterable[Tuple[str, ObservationBatch]]
+        Type of the observations and their batch (e.g. from iter_observation_chunks)
+        or SharedChunk.
+    file : IO[bytes]
+        Opened binary file (or buffer) to write to.
+    progress : ProgressReporter or None
+        Is advanced by the screw runs and bytes of every chunk that was written.
+
+    Returns
+    -------
+    int
+        Number of observations that were written.
+    """
+    header = (CSV_HEADER + "\n").encode("ascii")
+    file.write(header)
+    if progress is not None:
+        progress.advance(0, len(header))
+    written = 0
+    for obs_type, batch in chunks:
+        # the workers of iter_observation_chunks_parallel may have formatted the rows
+        data = getattr(batch, "csv", None)
+        if data is None:
+            data = format_chunk(obs_type, batch)
+        file.write(data)
+        written += len(batch)
+        if progress is not None:
+            progress.advance(len(batch), len(data))
+    return written
@@ -0,0 +1,221 @@
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.ndimage import correlate1d
+from scipy.signal import fftconvolve, savgol_coeffs
+
+# window length from which the FFT-based convolution is faster than the direct one
+# (measured with benchmarks/savgol.py on the grid of the default configuration)
+FFT_WINDOW_LENGTH = 31
+
+
+@lru_cache(maxsize=32)
+def get_savgol_weights(window_length: int, polyorder: int) -> np.ndarray:
+    """Returns the (cached) weights of a Savitzky-Golay filter for a correlation.
+
+    Parameters
+    ----------
+    window_length : int
+        Length of the filter window (odd number of points).
+    polyorder : int
+        Order of the polynomial used to fit the points in the window.
+
+    Returns
+    -------
+    np.ndarray
+        Read-only array with the weights of the filter window.
+    """
+    # savgol_coeffs returns the coefficients for a convolution, so they are reversed
+    weights = savgol_coeffs(window_length, polyorder)[::-1].copy()
+    weights.flags.writeable = False
+    return weights
+
+
+@lru_cache(maxsize=32)
+def get_savgol_edge_fit(
+    window_length: int, polyorder: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the (cached) matrices for the edges of savgol_filter with mode="interp".
+
+    At the edges, savgol_filter fits a polynomial to the first (last) window_length
+    points and evaluates it at the first (last) window_length // 2 positions. The fit
+    reduces a window to the polyorder + 1 coefficients of the polynomial, so the costs
+    grow linearly with the window instead of with its square.
+
+    Parameters
+    ----------
+    window_length : int
+        Length of the filter window (odd number of points).
+    polyorder : int
+        Order of the polynomial used to fit the points in the window.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        Read-only least-squares fit of shape (polyorder + 1, window_length) and the
+        polynomials evaluated at the start and the end of the window, both of shape
+        (window_length // 2, polyorder + 1).
+    """
+    half = window_length // 2
+    # positions scaled to [-1, 1], so the Vandermonde matrix is well conditioned
+    basis = np.vander(np.linspace(-1, 1, window_length), polyorder + 1, increasing=True)
+    fit = np.linalg.pinv(basis)
+    start, end = basis[:half].copy(), basis[window_length - half :].copy()
+    for matrix in (fit, start, end):
+        matrix.flags.writeable = False
+    return fit, start, end
+
+
+def apply_savgol_edges(
+    y_values: np.ndarray,
+    y_filtered: np.ndarray,
+    start: np.ndarray,
+    stop: np.ndarray,
+    window_length: int,
+    polyorder: int,
+) -> np.ndarray:
+    """Replaces the edges of every run by the edges of savgol_filter with mode="interp".
+
+    Each run only uses its own values: the window at its start (end) is gathered from
+    y_values, fitted and evaluated with the matrices of get_savgol_edge_fit, for all
+    runs at once. Runs shorter than window_length keep their values.
+
+    Parameters
+    ----------
+    y_values : np.ndarray
+        Unfiltered array of shape (runs, length).
+    y_filtered : np.ndarray
+        Filtered array with the same shape, its edges are replaced in place.
+    start : np.ndarray
+        Index of the first value of every run in axis 1.
+    stop : np.ndarray
+        Index after the last value of every run in axis 1.
+    window_length : int
+        Length of the filter window (odd number of points).
+    polyorder : int
+        Order of the polynomial used to fit the points in the window.
+
+    Returns
+    -------
+    np.ndarray
+        y_filtered with the replaced edges.
+    """
+    half = window_length // 2
+    runs = np.flatnonzero(stop - start >= window_length)
+    if half == 0 or len(runs) == 0:
+        return y_filtered
+    fit, start_basis, end_basis = get_savgol_edge_fit(window_length, polyorder)
+    # every row of a run is gathered (and written) as one window of consecutive values
+    windows = sliding_window_view(y_values, window_length, axis=1)
+    edges = sliding_window_view(y_filtered, half, axis=1, writeable=True)
+    for first, basis, offset in [
+        (start[runs], start_basis, 0),
+        (stop[runs] - window_length, end_basis, window_length - half),
+    ]:
+        coefficients = windows[runs, first] @ fit.T
+        edges[runs, first + offset] = coefficients @ basis.T
+    return y_filtered
+
+
+def correlate(y_values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Correlates all rows of y_values with the weights, repeating the values at the edges.
+
+    Uses the same alignment as scipy.ndimage.correlate1d with mode="nearest". Windows
+    with at least FFT_WINDOW_LENGTH points are applied using an FFT-based convolution
+    instead. Its transform only covers the rows and one window (the repeated edges are
+    added afterwards), so the costs grow slowly with the window.
+
+    Parameters
+    ----------
+    y_values : np.ndarray
+        Array of shape (runs, length) that is filtered along axis 1.
+    weights : np.ndarray
+        Weights of the filter window.
+
+    Returns
+    -------
+    np.ndarray
+        Filtered array with the same shape as y_values.
+    """
+    if (
+        len(weights) < FFT_WINDOW_LENGTH
+        or y_values.shape[1] < len(weights)
+        or y_values.size == 0
+    ):
+        return correlate1d(y_values, weights, axis=1, mode="nearest")
+    # the FFT pads with zeros, the repeated edge values are added by the sums of the
+    # weights that fall outside of the rows (without growing the transform)
+    y_filtered = fftconvolve(y_values, weights[None, ::-1], mode="same", axes=1)
+    left = len(weights) // 2
+    right = len(weights) - 1 - left
+    if left:
+        y_filtered[:, :left] += y_values[:, :1] * np.cumsum(weights)[left - 1 :: -1]
+    if right:
+        y_filtered[:, -right:] += y_values[:, -1:] * np.cumsum(weights[::-1])[:right]
+    return y_filtered
+
+
+def pad_convolve_edges(
+    y_values: np.ndarray, start: np.ndarray, stop: np.ndarray
+) -> np.ndarray:
+    """Pads every run like Observation.apply_convolve_filter before a moving average.
+
+    np.convolve with mode="same" fills the values before a run with zeros, and the
+    appended points repeat the last value of the run (at its last x value - 1).
+
+    Parameters
+    ----------
+    y_values : np.ndarray
+        Array of shape (runs, length) on a grid that covers the margin of the filter.
+    start : np.ndarray
+        Index of the first value of every run in axis 1.
+    stop : np.ndarray
+        Index after the last value of every run in axis 1.
+
+    Returns
+    -------
+    np.ndarray
+        Padded copy of y_values.
+    """
+    if y_values.size == 0:
+        return y_values
+    columns = np.arange(y_values.shape[1])
+    last = np.clip(stop - 1, 0, y_values.shape[1] - 1)[:, None]
+    y_padded = np.where(columns < start[:, None], 0.0, y_values)
+    return np.where(
+        columns >= stop[:, None],
+        np.take_along_axis(y_values, last, axis=1),
+        y_padded,
+    )
+
+
+def moving_average(y_values: np.ndarray, box_pts: int) -> np.ndarray:
+    """Returns the moving average with <box_pts> points of all rows of y_values.
+
+    Uses a running sum, so the costs do not depend on box_pts. The alignment and the
+    repeated values at the edges are the same as for correlate with a box window.
+
+    Parameters
+    ----------
+    y_values : np.ndarray
+        Array of shape (runs, length) that is filtered along axis 1.
+    box_pts : int
+        Number of points of the moving average.
+
+    Returns
+    -------
+    np.ndarray
+        Filtered array with the same shape as y_values.
+    """
+    if y_values.size == 0:
+        return y_values.astype(float)
+    left = box_pts // 2
+    right = box_pts - 1 - left
+    # pad the whole batch once and start every running sum with zero
+    y_padded = np.pad(y_values, ((0, 0), (left + 1, right)), mode="edge")
+    y_padded[:, 0] = 0
+    running_sum = np.cumsum(y_padded, axis=1)
+    return (running_sum[:, box_pts:] - running_sum[:, :-box_pts]) / box_pts
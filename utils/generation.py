@@ -0,0 +1,370 @@
+import os
+import numpy as np
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterator, Tuple
+
+from utils.configuration import Configuration
+from utils.export import format_chunk
+from utils.noise import CounterRNG, get_key
+from utils.observation import ObservationBatch
+
+# all types of observations in the order of their random streams
+OBS_TYPES = [
+    "ok",
+    "anomaly_type_01",
+    "anomaly_type_02",
+    "anomaly_type_03",
+    "anomaly_type_04",
+]
+# maximum number of observations that are generated as one batch
+CHUNK_SIZE = 1000
+
+
+def get_amount(Config: Configuration, obs_type: str) -> int:
+    """Returns the amount of observations of the given type to generate."""
+    amounts = {
+        "ok": Config.number_of_ok,
+        "anomaly_type_01": Config.anomaly_type_1_generate_amount,
+        "anomaly_type_02": Config.anomaly_type_2_generate_amount,
+        "anomaly_type_03": Config.anomaly_type_3_generate_amount,
+        "anomaly_type_04": Config.anomaly_type_4_generate_amount,
+    }
+    return int(amounts[obs_type])
+
+
+def get_rng(seed: int, obs_type: str, index: np.ndarray) -> CounterRNG:
+    """Returns the random generator for the observations of a type with the given indices.
+
+    Each type has its own key derived from SeedSequence(seed), so its runs do not
+    depend on the amounts of the other types. Within a type, every run only depends
+    on its index, which allows to generate any run directly.
+
+    Parameters
+    ----------
+    seed : int
+        Seed of the random generation (Config.seed).
+    obs_type : str
+        Type of the observations (see OBS_TYPES).
+    index : np.ndarray
+        Indices of the observations within their type.
+
+    Returns
+    -------
+    CounterRNG
+        Counter-based random generator for the observations.
+    """
+    return CounterRNG(get_key(int(seed), OBS_TYPES.index(obs_type)), index)
+
+
+def generate_observation(
+    Config: Configuration, obs_type: str, index: int
+) -> ObservationBatch:
+    """Generates the observation with the given index of a type as a batch with one run.
+
+    The run matches the same index of generate_observations (up to floating point
+    precision of the FFT-based and running-sum filters, which depend on the grid).
+    """
+    rng = get_rng(Config.seed, obs_type, np.array([index]))
+    return ObservationBatch(Config, obs_type, 1, rng=rng)
+
+
+def iter_observations(
+    Config: Configuration,
+    obs_type: str,
+    n: int,
+    start: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[ObservationBatch]:
+    """Generates n observations of the given type as batches of at most chunk_size runs.
+
+    The batches are generated one at a time, so only a single batch is kept in memory.
+
+    Parameters
+    ----------
+    Config : Configuration
+        Details of the current configuration
+    obs_type : str
+        Type of the observations (see OBS_TYPES).
+    n : int
+        Number of observations to generate.
+    start : int
+        Index of the first observation to generate.
+    chunk_size : int
+        Maximum number of observations per batch.
+
+    Yields
+    ------
+    ObservationBatch
+        Reproducible batches of observations according to Config.seed.
+    """
+    n = int(n)
+    for first in range(start, start + n, chunk_size):
+        index = np.arange(first, min(first + chunk_size, start + n))
+        rng = get_rng(Config.seed, obs_type, index)
+        yield ObservationBatch(Config, obs_type, len(index), rng=rng)
+
+
+def generate_observations(
+    Config: Configuration,
+    obs_type: str,
+    n: int,
+    start: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+) -> "list[ObservationBatch]":
+    """Returns the batches of iter_observations as list."""
+    return list(iter_observations(Config, obs_type, n, start, chunk_size))
+
+
+def get_chunks(
+    Config: Configuration, chunk_size: int = CHUNK_SIZE
+) -> "list[Tuple[str, int, int]]":
+    """Returns the planned observations as chunks of (obs_type, start, n)."""
+    chunks = []
+    for obs_type in OBS_TYPES:
+        amount = get_amount(Config, obs_type)
+        for start in range(0, amount, chunk_size):
+            chunks.append((obs_type, start, min(chunk_size, amount - start)))
+    return chunks
+
+
+def generate_chunk(
+    Config: Configuration, obs_type: str, start: int, n: int
+) -> Tuple[str, ObservationBatch]:
+    """Generates a single chunk of observations (also used as task for the workers)."""
+    rng = get_rng(Config.seed, obs_type, np.arange(start, start + n))
+    return obs_type, ObservationBatch(Config, obs_type, n, rng=rng)
+
+
+def iter_observation_chunks(
+    Config: Configuration, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[str, ObservationBatch]]:
+    """Generates all observations planned by the Configuration chunk by chunk.
+
+    Sinks (e.g. write_csv) consume the chunks one at a time, so the peak memory only
+    depends on chunk_size and not on the size of the dataset.
+
+    Parameters
+    ----------
+    Config : Configuration
+        Details of the current configuration
+    chunk_size : int
+        Maximum number of observations per chunk.
+
+    Yields
+    ------
+    Tuple[str, ObservationBatch]
+        Type of the observations and the batch with at most chunk_size runs.
+    """
+    for chunk in get_chunks(Config, chunk_size):
+        yield generate_chunk(Config, *chunk)
+
+
+def iter_observation_chunks_threaded(
+    Config: Configuration,
+    chunk_size: int = CHUNK_SIZE,
+    max_workers: "int | None" = None,
+) -> Iterator[Tuple[str, ObservationBatch]]:
+    """Generates the chunks of iter_observation_chunks in a pool of threads.
+
+    NumPy releases the GIL in the vectorized stages of ObservationBatch, so the
+    threads run on several cores without leaving the current process (e.g. the
+    Streamlit server). Each chunk has its own counter-based generator, hence the
+    threads share no random state and the output is identical to
+    iter_observation_chunks. At most two chunks per worker are generated in advance.
+
+    Parameters
+    ----------
+    Config : Configuration
+        Details of the current configuration
+    chunk_size : int
+        Maximum number of observations per chunk.
+    max_workers : int or None
+        Number of threads, defaults to the number of CPUs.
+
+    Yields
+    ------
+    Tuple[str, ObservationBatch]
+        Type of the observations and the batch with at most chunk_size runs.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        try:
+            for chunk in get_chunks(Config, chunk_size):
+                pending.append(executor.submit(generate_chunk, Config, *chunk))
+                if len(pending) >= 2 * max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # skip the chunks that were not started yet
+            for future in pending:
+                future.cancel()
+
+
+class SharedChunk:
+    """Chunk of observations generated by a worker, stored in a shared memory block.
+
+    The y values are a zero-copy view on the block. Like an ObservationBatch, the chunk
+    provides index, x_values and y_values, which is all the sinks need. If the worker
+    already formatted the chunk, the block contains its csv rows instead, which are
+    available as csv (and y_values is None).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        obs_type: str,
+        start: int,
+        first: int,
+        shape: Tuple[int, int],
+        csv_size: "int | None" = None,
+    ):
+        self.obs_type = obs_type
+        self.shm = SharedMemory(name=name)
+        self.index = np.arange(start, start + shape[0])
+        self.x_values = np.arange(first, first + shape[1])
+        if csv_size is None:
+            self.y_values = np.ndarray(shape, dtype=float, buffer=self.shm.buf)
+            self.csv = None
+        else:
+            self.y_values = None
+            self.csv = self.shm.buf[:csv_size]
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def release(self) -> None:
+        """Frees the shared memory block, the values must not be used afterwards."""
+        self.y_values = None
+        if self.csv is not None:
+            self.csv.release()
+            self.csv = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # views on the block are still in use, it is freed once they are deleted
+            pass
+        self.shm.unlink()
+
+
+def generate_shared_chunk(
+    Config: Configuration, obs_type: str, start: int, n: int, format_csv: bool = False
+) -> Tuple[str, str, int, int, Tuple[int, int], "int | None"]:
+    """Generates a chunk of observations into a new shared memory block.
+
+    With format_csv, the worker formats the csv rows of the chunk and only these are
+    stored. Only the metadata to open the block as SharedChunk is returned to the
+    parent.
+    """
+    _, batch = generate_chunk(Config, obs_type, start, n)
+    if format_csv:
+        data = np.frombuffer(format_chunk(obs_type, batch), dtype=np.uint8)
+        csv_size = len(data)
+    else:
+        data = batch.y_values
+        csv_size = None
+    shm = SharedMemory(create=True, size=max(data.nbytes, 1))
+    np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)[:] = data
+    # the parent takes over the block, so the worker must not remove it on exit
+    resource_tracker.unregister(shm._name, "shared_memory")
+    shm.close()
+    first = int(batch.x_values[0]) if len(batch.x_values) else 0
+    return shm.name, obs_type, start, first, batch.y_values.shape, csv_size
+
+
+def iter_observation_chunks_parallel(
+    Config: Configuration,
+    chunk_size: int = CHUNK_SIZE,
+    max_workers: "int | None" = None,
+    format_csv: bool = False,
+) -> Iterator[Tuple[str, SharedChunk]]:
+    """Generates the chunks of iter_observation_chunks in a pool of processes.
+
+    Every run only depends on the seed, its type and its index, so the chunks do not
+    depend on the worker that generates them. They are yielded in the same order as
+    by iter_observation_chunks, hence the output is identical for any number of
+    workers. At most two chunks per worker are generated in advance.
+
+    The workers write the y values into shared memory blocks and only send their
+    metadata. Each block is freed as soon as the next chunk is requested, so a chunk
+    has to be copied if it is needed afterwards. With format_csv, the workers also
+    format the csv rows (see write_csv), so the parent only writes the files and the
+    formatting scales with the number of workers.
+
+    Parameters
+    ----------
+    Config : Configuration
+        Details of the current configuration
+    chunk_size : int
+        Maximum number of observations per chunk.
+    max_workers : int or None
+        Number of processes, defaults to the number of CPUs.
+    format_csv : bool
+        Transfers the csv rows of every chunk instead of its y values.
+
+    Yields
+    ------
+    Tuple[str, SharedChunk]
+        Type of the observations and the chunk with at most chunk_size runs.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        try:
+            for chunk in get_chunks(Config, chunk_size):
+                pending.append(
+                    executor.submit(generate_shared_chunk, Config, *chunk, format_csv)
+                )
+                if len(pending) >= 2 * max_workers:
+                    yield from yield_shared_chunk(pending.popleft())
+            while pending:
+                yield from yield_shared_chunk(pending.popleft())
+        finally:
+            # free the blocks of all chunks that were not consumed
+            for future in pending:
+                if not future.cancel():
+                    SharedChunk(*future.result()).release()
+
+
+def yield_shared_chunk(future: Future) -> Iterator[Tuple[str, SharedChunk]]:
+    """Yields the chunk of a finished task and frees its block once it is consumed."""
+    chunk = SharedChunk(*future.result())
+    try:
+        yield chunk.obs_type, chunk
+    finally:
+        chunk.release()
+
+
+class SyntheticDataset:
+    """Lazy view of all observations that are planned by the Configuration.
+
+    Nothing is stored: the observation with index i is generated on access. The
+    observations are ordered by type (see OBS_TYPES) and by their index in the type.
+    """
+
+    def __init__(self, Config: Configuration):
+        self.Config = Config
+        self.amounts = [get_amount(Config, obs_type) for obs_type in OBS_TYPES]
+        # index of the first observation of every type
+        self.offsets = np.cumsum([0] + self.amounts)
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def locate(self, index: int) -> Tuple[str, int]:
+        """Returns the type and the index within the type of an observation."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Observation index out of range")
+        type_idx = int(np.searchsorted(self.offsets, index, side="right")) - 1
+        return OBS_TYPES[type_idx], index - int(self.offsets[type_idx])
+
+    def __getitem__(self, index: int) -> ObservationBatch:
+        obs_type, type_index = self.locate(index)
+        return generate_observation(self.Config, obs_type, type_index)
@@ -0,0 +1,119 @@
+import numpy as np
+
+from utils.configuration import Configuration
+
+
+def get_point_index(point: str) -> int:
+    """Returns the index of a point from its name (e.g. "P12", "x12" or "y12" -> 12).
+
+    Parameters
+    ----------
+    point : str
+        Name of the point as used in the Configuration and in the side bar.
+
+    Returns
+    -------
+    int
+        Index of the point in the linear basis.
+    """
+    return int(point[1:])
+
+
+class Keypoints:
+    """Points of the linear basis for a batch of screw runs.
+
+    Both x and y are float arrays of shape (runs, points), so that all stages can
+    update the keypoints of every run at once using broadcasting.
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray):
+        if x.shape != y.shape:
+            raise ValueError("X and Y have different number of steps")
+        self.x = x
+        self.y = y
+
+    @classmethod
+    def from_config(cls, Config: Configuration, runs: int) -> "Keypoints":
+        """Returns the linear basis of the Configuration repeated for the number of runs."""
+        x = np.array(list(Config.x_steps.values()), float)
+        y = np.array(list(Config.y_steps.values()), float)
+        return cls(np.tile(x, (runs, 1)), np.tile(y, (runs, 1)))
+
+    def __len__(self) -> int:
+        return self.x.shape[0]
+
+    @property
+    def points(self) -> int:
+        """Number of points of the linear basis."""
+        return self.x.shape[1]
+
+    @property
+    def first(self) -> np.ndarray:
+        """x value of the first point of every run as column (runs, 1)."""
+        return self.x[:, :1]
+
+    @property
+    def last(self) -> np.ndarray:
+        """x value of the last point of every run as column (runs, 1)."""
+        return self.x[:, -1:]
+
+    def shift_x(self, point: int, offset: np.ndarray) -> None:
+        """Shifts the point and all following points by an offset per run and cuts them to int."""
+        self.x[:, point:] = np.trunc(self.x[:, point:] + np.reshape(offset, (-1, 1)))
+
+    def shift_y(self, point: int, offset: np.ndarray) -> None:
+        """Shifts the y value of a single point by an offset per run."""
+        self.y[:, point] += offset
+
+    def insert(self, point: int, x: "list[np.ndarray]", y: "list[np.ndarray]") -> None:
+        """Inserts new points (one value per run each) before the point with the given index."""
+        x_new = np.column_stack([np.broadcast_to(v, len(self)) for v in x])
+        y_new = np.column_stack([np.broadcast_to(v, len(self)) for v in y])
+        self.x = np.concatenate([self.x[:, :point], x_new, self.x[:, point:]], axis=1)
+        self.y = np.concatenate([self.y[:, :point], y_new, self.y[:, point:]], axis=1)
+
+    def round_x(self) -> None:
+        """Rounds the x values of all points "back to int"."""
+        self.x = np.round(self.x, 0)
+
+    def interpolate(self, x_values: np.ndarray) -> np.ndarray:
+        """Evaluates the piecewise-linear basis of all runs at once.
+
+        Points that share the same x value form a leap: the basis jumps to the y value
+        of the later point, like Observation.apply_linear_interpolation does. Points
+        that step back behind a previous point are treated as a leap as well. Before
+        the first and after the last point the y values are held constant.
+
+        Parameters
+        ----------
+        x_values : np.ndarray
+            Grid of consecutive integer x values (rotation angles), shared by all runs.
+
+        Returns
+        -------
+        np.ndarray
+            Interpolated y values of shape (runs, len(x_values)).
+        """
+        runs, points = self.x.shape
+        length = len(x_values)
+        x_steps = np.maximum.accumulate(self.x, axis=1)
+
+        # count the points <= x for every run and x value (a row-wise searchsorted with
+        # side="right"): on an integer grid a point is passed from ceil(point) onwards
+        passed = np.clip(np.ceil(x_steps) - (x_values[0] if length else 0), 0, length)
+        bins = passed.astype(np.int64) + (np.arange(runs) * (length + 1))[:, None]
+        count = np.bincount(bins.ravel(), minlength=runs * (length + 1))
+        count = count.reshape(runs, length + 1).cumsum(axis=1)[:, :length]
+
+        # slope and intercept of every segment, including the constant ends of the basis
+        dx = np.diff(x_steps, axis=1)
+        slope = np.divide(
+            np.diff(self.y, axis=1), dx, out=np.zeros_like(dx), where=dx > 0
+        )
+        slope = np.pad(slope, ((0, 0), (1, 1)))
+        intercept = np.pad(self.y, ((0, 0), (1, 0)), mode="edge") - slope * np.pad(
+            x_steps, ((0, 0), (1, 0)), mode="edge"
+        )
+        # evaluate the segment that belongs to every x value
+        segment = count + (np.arange(runs) * (points + 1))[:, None]
+        return np.take(intercept, segment) + np.take(slope, segment) * x_values
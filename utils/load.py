@@ -1,15 +1,20 @@
-from PIL import Image
-from typing import Any, Dict, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Tuple
 from pathlib import Path
 
 import toml
 
+if TYPE_CHECKING:
+    from PIL import Image
+
 
 def get_root() -> str:
     return str(Path(__file__).parent.parent)
 
 
-def get_image(name: str) -> Image:
+def get_image(name: str) -> "Image.Image":
+    # import PIL only when an image is needed
+    from PIL import Image
+
     return Image.open(Path(get_root()) / f"images/{name}")
 
 
@@ -36,8 +41,9 @@ def get_config(
     readme_config : dict
         Written information for online texts.
     """
-    parameter_config = toml.load(Path(get_root()) / f"config/{parameter_file}")
-    tooltip_config = toml.load(Path(get_root()) / f"config/{tooltips_file}")
-    readme_config = toml.load(Path(get_root()) / f"config/{readme_file}")
+    # file names are relative to the config folder (absolute paths are kept)
+    parameter_config = toml.load(Path(get_root()) / "config" / parameter_file)
+    tooltip_config = toml.load(Path(get_root()) / "config" / tooltips_file)
+    readme_config = toml.load(Path(get_root()) / "config" / readme_file)
 
     return dict(parameter_config), dict(tooltip_config), dict(readme_config)
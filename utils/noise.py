@@ -0,0 +1,142 @@
+import numpy as np
+
+from typing import Tuple
+from scipy.special import ndtri
+
+# constants of the SplitMix64 generator
+GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+MIX_MULTIPLIER_1 = np.uint64(0xBF58476D1CE4E5B9)
+MIX_MULTIPLIER_2 = np.uint64(0x94D049BB133111EB)
+
+
+def get_generator(rng: "np.random.Generator | None" = None) -> np.random.Generator:
+    """Returns the given random generator or a new one with fresh entropy."""
+    return rng if rng is not None else np.random.default_rng()
+
+
+def get_key(seed: "int | None", stream: int) -> np.uint64:
+    """Returns the key of a counter-based random stream.
+
+    Parameters
+    ----------
+    seed : int or None
+        Seed of the random generation, None for fresh entropy.
+    stream : int
+        Index of the independent stream (e.g. one per type of observation).
+
+    Returns
+    -------
+    np.uint64
+        Key for the CounterRNG.
+    """
+    seed_sequence = np.random.SeedSequence(seed, spawn_key=(int(stream),))
+    return seed_sequence.generate_state(1, np.uint64)[0]
+
+
+def mix(z: np.ndarray) -> np.ndarray:
+    """Hashes an array of uint64 counters using the SplitMix64 output function."""
+    z = z + GOLDEN_GAMMA
+    z = (z ^ (z >> np.uint64(30))) * MIX_MULTIPLIER_1
+    z = (z ^ (z >> np.uint64(27))) * MIX_MULTIPLIER_2
+    return z ^ (z >> np.uint64(31))
+
+
+class CounterRNG:
+    """Counter-based random generator for a batch of runs.
+
+    Every random value is a hash of (key, index of the run, number of the draw, column),
+    so the values of a run do not depend on the other runs of the batch. Hence, a
+    single run can be generated directly from its index and matches the same run in
+    a large batch. It provides the methods of np.random.Generator that are used for
+    the generation, but every draw returns one row per run: size must be the number of
+    runs or (runs, columns) for a view created by at().
+    """
+
+    def __init__(
+        self,
+        key: np.uint64,
+        index: np.ndarray,
+        columns: "np.ndarray | None" = None,
+        draws: "list[int] | None" = None,
+    ):
+        self.key = np.uint64(key)
+        self.index = np.asarray(index, np.int64).astype(np.uint64)
+        self.columns = columns
+        # draws are counted in the order of the calls, views share the counter
+        self.draws = draws if draws is not None else [0]
+
+    def at(self, columns: np.ndarray) -> "CounterRNG":
+        """Returns a view that draws one value per run and column (e.g. rotation angle)."""
+        return CounterRNG(self.key, self.index, np.asarray(columns), self.draws)
+
+    def random(self, size: "int | Tuple[int, ...] | None" = None) -> np.ndarray:
+        """Returns uniformly distributed values in the open interval (0, 1)."""
+        draw = np.uint64(self.draws[0])
+        self.draws[0] += 1
+        counter = mix(self.index + self.key)[:, None] ^ draw
+        if self.columns is None:
+            columns = np.zeros(1, np.uint64)
+        else:
+            columns = np.asarray(self.columns, np.int64).astype(np.uint64)
+        z = mix(mix(counter) + columns)
+        if self.columns is None:
+            z = z[:, 0]
+        if size is not None and np.shape(z) != tuple(np.atleast_1d(size)):
+            raise ValueError(f"Size {size} does not match the runs and columns")
+        # use the upper 53 bits as in np.random.Generator.random, but exclude zero
+        return ((z >> np.uint64(11)).astype(float) + 0.5) * 2.0**-53
+
+    def normal(
+        self, loc: float = 0.0, scale: float = 1.0, size: "int | Tuple[int, ...]" = None
+    ) -> np.ndarray:
+        # inverse of the cumulative distribution function
+        return loc + scale * ndtri(self.random(size))
+
+    def uniform(
+        self, low: float = 0.0, high: float = 1.0, size: "int | Tuple[int, ...]" = None
+    ) -> np.ndarray:
+        return low + (high - low) * self.random(size)
+
+    def weibull(self, a: float, size: "int | Tuple[int, ...]" = None) -> np.ndarray:
+        # inverse of the cumulative distribution function
+        return (-np.log1p(-self.random(size))) ** (1 / a)
+
+
+def get_random_values(
+    rng: "np.random.Generator | CounterRNG",
+    selected_type: str,
+    normal_stadev: float,
+    uniform_range: float,
+    weibull_alpha: float,
+    size: "int | Tuple[int, ...]",
+) -> np.ndarray:
+    """Draws a block of random values according to the selected distribution in one call.
+
+    Parameters
+    ----------
+    rng : np.random.Generator or CounterRNG
+        Random generator used to draw the values.
+    selected_type : str
+        Type of random distribution to apply ("Normal", "Uniform" or "Weibull").
+    normal_stadev : float
+        Standard deviation for normal distribution.
+    uniform_range : float
+        Range for uniform distribution (centered around zero).
+    weibull_alpha : float
+        Alpha value (scale) for weibull distribution.
+    size : int or tuple
+        Shape of the returned array.
+
+    Returns
+    -------
+    np.ndarray
+        Random values with the requested shape.
+    """
+    if selected_type == "Normal":
+        return rng.normal(0, normal_stadev, size)
+    if selected_type == "Uniform":
+        return rng.uniform(-uniform_range / 2, uniform_range / 2, size)
+    if selected_type == "Weibull":
+        # same as random.weibullvariate(alpha, beta=1.0)
+        return weibull_alpha * rng.weibull(1.0, size)
+    raise ValueError(f"Unknown type of random distribution: {selected_type}")
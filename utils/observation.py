@@ -1,8 +1,19 @@
 from random import gauss, uniform, weibullvariate, randint
 from numpy import convolve, ones
 
+import numpy as np
+
 from typing import Tuple
 from utils.configuration import Configuration
+from utils.filter import (
+    apply_savgol_edges,
+    correlate,
+    get_savgol_weights,
+    moving_average,
+    pad_convolve_edges,
+)
+from utils.keypoints import Keypoints, get_point_index
+from utils.noise import CounterRNG, get_generator, get_key, get_random_values
 from scipy.signal import savgol_filter
 
 
@@ -123,41 +134,32 @@ class Observation:
 
     def apply_rnd_scattering(self, y_values: list, Config: Configuration) -> list:
         # apply random scattering to the entire observation
-        if Config.rnd_scattering_selected_type == "Normal":
-            return [y + gauss(0, Config.rnd_scattering_normal_stadev) for y in y_values]
-        if Config.rnd_scattering_selected_type == "Uniform":
-            uniform_range = Config.rnd_scattering_uniform_range / 2
-            return [y + uniform(-uniform_range, uniform_range) for y in y_values]
-        if Config.rnd_scattering_selected_type == "Weibull":
-            return [
-                y + weibullvariate(Config.rnd_scattering_weibull_alpha, beta=1.0)
-                for y in y_values
-            ]
+        noise = get_random_values(
+            get_generator(),
+            Config.rnd_scattering_selected_type,
+            Config.rnd_scattering_normal_stadev,
+            Config.rnd_scattering_uniform_range,
+            Config.rnd_scattering_weibull_alpha,
+            size=len(y_values),
+        )
+        return (np.asarray(y_values, float) + noise).tolist()
 
     def apply_rnd_tighteining(self, y_values: list, Config: Configuration) -> list:
         # apply additional scattering to the selected subset of the observation
         upper = Config.rnd_tightening_upper_xlimitation
         lower = Config.rnd_tightening_lower_xlimitation
-        if Config.rnd_tightening_selected_type == "Normal":
-            return [
-                y + gauss(0, Config.rnd_tightening_normal_stadev)
-                if (lower < x < upper)
-                else y
-                for x, y in zip(range(len(y_values)), y_values)
-            ]
-        if Config.rnd_tightening_selected_type == "Uniform":
-            uniform_range = Config.rnd_tightening_uniform_range / 2
-            return [
-                y + uniform(-uniform_range, uniform_range) if (lower < x < upper) else y
-                for x, y in zip(range(len(y_values)), y_values)
-            ]
-        if Config.rnd_tightening_selected_type == "Weibull":
-            return [
-                y + weibullvariate(Config.rnd_tightening_weibull_alpha, beta=1.0)
-                if (lower < x < upper)
-                else y
-                for x, y in zip(range(len(y_values)), y_values)
-            ]
+        x = np.arange(len(y_values))
+        in_range = (lower < x) & (x < upper)
+        y = np.asarray(y_values, float)
+        y[in_range] += get_random_values(
+            get_generator(),
+            Config.rnd_tightening_selected_type,
+            Config.rnd_tightening_normal_stadev,
+            Config.rnd_tightening_uniform_range,
+            Config.rnd_tightening_weibull_alpha,
+            size=int(in_range.sum()),
+        )
+        return y.tolist()
 
     def remove_neg_y_values(self, y_values, substitute=0) -> list:
         # remove all negative values and insert zero
@@ -182,7 +184,7 @@ class Observation:
                     if not Config.offset_hori_equalize:
                         offset = gauss(0, Config.offset_hori_normal_stadev)
                     # loop over the selected point and all following points to apply the offset
-                    for p in range(int(point[-1:]), len(x_steps)):
+                    for p in range(get_point_index(point), len(x_steps)):
                         x_steps[f"x{p}"] = int(x_steps[(f"x{p}")] + offset)
             # uniform
             if Config.offset_hori_selected_type == "Uniform":
@@ -195,7 +197,7 @@ class Observation:
                     if not Config.offset_hori_equalize:
                         offset = uniform(-uniform_range, uniform_range)
                     # loop over the selected point and all following points to apply the offset
-                    for p in range(int(point[-1:]), len(x_steps)):
+                    for p in range(get_point_index(point), len(x_steps)):
                         x_steps[f"x{p}"] = int(x_steps[(f"x{p}")] + offset)
             # weibull
             if Config.offset_hori_selected_type == "Weibull":
@@ -209,7 +211,7 @@ class Observation:
                             Config.offset_hori_weibull_alpha, beta=1.0
                         )
                     # loop over the selected point and all following points to apply the offset
-                    for p in range(int(point[-1:]), len(x_steps)):
+                    for p in range(get_point_index(point), len(x_steps)):
                         x_steps[f"x{p}"] = int(x_steps[(f"x{p}")] + offset)
             # x_steps now contains the adjusted steps according to the selected offsets
             return x_steps
@@ -221,8 +223,6 @@ class Observation:
             return Config.y_steps
         # apply vertical offset
         else:
-            import streamlit as st
-
             # steps as new dict
             y_steps = {k: Config.y_steps[k] for k in Config.y_steps.keys()}
             if Config.offset_vert_selected_type == "Normal":
@@ -231,8 +231,8 @@ class Observation:
                 if not Config.offset_vert_equalize:
                     offset = gauss(0, Config.offset_vert_normal_stadev)
                 for point in Config.offset_vert_selected_points:
-                    y_steps[f"y{point[-1:]}"] = float(
-                        y_steps[(f"y{point[-1:]}")] + offset
+                    y_steps[f"y{get_point_index(point)}"] = float(
+                        y_steps[(f"y{get_point_index(point)}")] + offset
                     )
 
             if Config.offset_vert_selected_type == "Uniform":
@@ -242,8 +242,8 @@ class Observation:
                 if not Config.offset_vert_equalize:
                     offset = uniform(-uniform_range, uniform_range)
                 for point in Config.offset_vert_selected_points:
-                    y_steps[f"y{point[-1:]}"] = float(
-                        y_steps[(f"y{point[-1:]}")] + offset
+                    y_steps[f"y{get_point_index(point)}"] = float(
+                        y_steps[(f"y{get_point_index(point)}")] + offset
                     )
 
             if Config.offset_vert_selected_type == "Weibull":
@@ -252,8 +252,8 @@ class Observation:
                 if not Config.offset_vert_equalize:
                     offset = weibullvariate(Config.offset_vert_weibull_alpha, beta=1.0)
                 for point in Config.offset_vert_selected_points:
-                    y_steps[f"y{point[-1:]}"] = float(
-                        y_steps[(f"y{point[-1:]}")] + offset
+                    y_steps[f"y{get_point_index(point)}"] = float(
+                        y_steps[(f"y{get_point_index(point)}")] + offset
                     )
             return y_steps
 
@@ -408,3 +408,329 @@ class Observation:
         )
         # round x_steps "back to int"
         self.x_steps = {key: round(self.x_steps[key], 0) for key in self.x_steps}
+
+
+class ObservationBatch:
+    """Vectorized counterpart of Observation that generates n screw runs at once.
+
+    All runs of a batch share a common grid of rotation angles (x_values). The
+    torque values are stored in an array of shape (n, len(x_values)), samples
+    outside of the individual range of a run are set to NaN. All random values are
+    drawn from a CounterRNG, so every run only depends on its index in rng.
+    """
+
+    def __init__(
+        self,
+        Config: Configuration,
+        obs_type: str,
+        n: int,
+        rng: "CounterRNG | None" = None,
+    ):
+        self.obs_type = obs_type
+        self.n = int(n)
+        # random generator used for all random values of the batch (one index per run)
+        if rng is None:
+            rng = CounterRNG(get_key(None, 0), np.arange(self.n))
+        if len(rng.index) != self.n:
+            raise ValueError("The random generator has a different number of runs")
+        self.rng = rng
+        # index of every run within its type of observation
+        self.index = self.rng.index.astype(np.int64)
+        # get keypoints as arrays (n, points), then apply all "Normal" transformations
+        self.keypoints = Keypoints.from_config(Config, self.n)
+        self.apply_horizontal_offset(Config)
+        self.apply_vertical_offset(Config)
+        # x and y step insertion for anomaly_type_01 and anomaly_type_02
+        if self.obs_type == "anomaly_type_01":
+            self.apply_type_1_anomaly(Config)
+        elif self.obs_type == "anomaly_type_02":
+            self.apply_type_2_anomaly(Config)
+        # x and y step distortion for anomaly_type_03 and anomaly_type_04
+        elif self.obs_type == "anomaly_type_03":
+            self.apply_type_3_anomaly(Config)
+        elif self.obs_type == "anomaly_type_04":
+            self.apply_type_4_anomaly(Config)
+        # x values as common grid, y values as array with one row per observation
+        self.x_values = self.get_x()
+        self.y_values = self.get_y(Config)
+
+    def __len__(self) -> int:
+        return self.n
+
+    @classmethod
+    def from_arrays(
+        cls,
+        obs_type: str,
+        index: np.ndarray,
+        keypoints: Keypoints,
+        x_values: np.ndarray,
+        y_values: np.ndarray,
+    ) -> "ObservationBatch":
+        """Creates a batch from already generated values (without a random generator)."""
+        batch = cls.__new__(cls)
+        batch.obs_type = obs_type
+        batch.n = len(index)
+        batch.rng = None
+        batch.index = np.asarray(index, np.int64)
+        batch.keypoints = keypoints
+        batch.x_values = x_values
+        batch.y_values = y_values
+        return batch
+
+    def head(self, n: int) -> "ObservationBatch":
+        """Returns a batch with the first n runs on the grid that covers these runs."""
+        keypoints = Keypoints(self.keypoints.x[:n], self.keypoints.y[:n])
+        head = self.from_arrays(self.obs_type, self.index[:n], keypoints, None, None)
+        head.x_values = head.get_x()
+        column = head.x_values[0] - self.x_values[0] if len(head.x_values) else 0
+        head.y_values = self.y_values[:n, column : column + len(head.x_values)]
+        return head
+
+    def get_x(self) -> np.ndarray:
+        """Returns the common grid of x values that covers all observations of the batch."""
+        # stride of one from the first x_steps to the last x_steps of all observations
+        if self.n == 0:
+            return np.arange(0)
+        first = int(np.floor(self.keypoints.first.min()))
+        last = int(np.ceil(self.keypoints.last.max()))
+        return np.arange(first, last)
+
+    def get_margin(self, Config: Configuration) -> int:
+        """Returns the number of additional x values the smoothing filter needs at both ends."""
+        if not Config.filter_apply:
+            return 0
+        # no margin for Savitzky-Golay, it fits the edges of every run from its own values
+        if Config.filter_type_selected == "Discrete Linear Convolution":
+            return int(Config.filter_conv_box_pts)
+        return 0
+
+    def get_y(self, Config: Configuration) -> np.ndarray:
+        """Returns an array that containts the y values after trainsformations according to parameter selection."""
+        # evaluate the linear interpolation on a grid that is extended by the filter margin
+        margin = self.get_margin(Config)
+        first = self.x_values[0] if len(self.x_values) else 0
+        x_padded = np.arange(first - margin, first + len(self.x_values) + margin)
+        y_values = self.apply_linear_interpolation(x_padded)
+
+        # add a filter to smoothen the interpolation according to selection
+        if Config.filter_apply:
+            if Config.filter_type_selected == "Savitzky-Golay-Filter":
+                y_values = self.apply_savitzky_golay_filter(y_values, Config, x_padded)
+            if Config.filter_type_selected == "Discrete Linear Convolution":
+                y_values = self.apply_convolve_filter(y_values, Config, x_padded)
+        # remove the margin again and mask all values outside of the individual observations
+        y_values = y_values[:, margin : margin + len(self.x_values)]
+        outside = (self.x_values < self.keypoints.first) | (
+            self.x_values >= self.keypoints.last
+        )
+        y_values[outside] = np.nan
+
+        # apply random scattering to the entire observation
+        if Config.rnd_scattering_apply:
+            y_values = self.apply_rnd_scattering(y_values, Config)
+        # apply additional scattering to the tightening phase
+        if Config.rnd_tightening_apply:
+            y_values = self.apply_rnd_tighteining(y_values, Config)
+        # remove any negative y values and set them to zero
+        if Config.remove_neg_y_values:
+            y_values = self.remove_neg_y_values(y_values)
+        # round y_values by six decimal places to avoid issues with precicion floating-point arithmetic
+        return np.round(y_values, 6)
+
+    def get_columns(self, x_values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the columns of the first and after the last value of every run in x_values."""
+        first = x_values[0] if len(x_values) else 0
+        start = np.ceil(self.keypoints.first[:, 0]).astype(np.int64) - first
+        stop = np.ceil(self.keypoints.last[:, 0]).astype(np.int64) - first
+        return start, stop
+
+    def apply_linear_interpolation(self, x_values: np.ndarray) -> np.ndarray:
+        """Returns the linear interpolation of the y steps of all observations at x_values."""
+        return self.keypoints.interpolate(x_values)
+
+    def apply_savitzky_golay_filter(
+        self, y_values: np.ndarray, Config: Configuration, x_values: np.ndarray
+    ) -> np.ndarray:
+        """Applies a Savitzky-Golay filter to smoothen the y data according to <window_length> and <poly_order>"""
+        window_length = int(Config.filter_sg_window_length)
+        polyorder = int(Config.filter_sg_poly_order)
+        y_filtered = correlate(y_values, get_savgol_weights(window_length, polyorder))
+        # fit the edges of every run like savgol_filter (mode="interp") of Observation
+        start, stop = self.get_columns(x_values)
+        return apply_savgol_edges(
+            y_values, y_filtered, start, stop, window_length, polyorder
+        )
+
+    def apply_convolve_filter(
+        self, y_values: np.ndarray, Config: Configuration, x_values: np.ndarray
+    ) -> np.ndarray:
+        """Applies discrete linear convolution to smoothen the y data according to <box_pts>"""
+        # pad every run like np.convolve (zeros) and the appended points of Observation
+        start, stop = self.get_columns(x_values)
+        y_values = pad_convolve_edges(y_values, start, stop)
+        return moving_average(y_values, int(Config.filter_conv_box_pts))
+
+    def apply_rnd_scattering(
+        self, y_values: np.ndarray, Config: Configuration
+    ) -> np.ndarray:
+        # apply random scattering to the entire observation
+        # the noise belongs to the rotation angle, not to the position in the grid
+        return y_values + get_random_values(
+            self.rng.at(self.x_values),
+            Config.rnd_scattering_selected_type,
+            Config.rnd_scattering_normal_stadev,
+            Config.rnd_scattering_uniform_range,
+            Config.rnd_scattering_weibull_alpha,
+            size=y_values.shape,
+        )
+
+    def apply_rnd_tighteining(
+        self, y_values: np.ndarray, Config: Configuration
+    ) -> np.ndarray:
+        # apply additional scattering to the selected subset of the observation
+        upper = Config.rnd_tightening_upper_xlimitation
+        lower = Config.rnd_tightening_lower_xlimitation
+        in_range = (lower < self.x_values) & (self.x_values < upper)
+        noise = get_random_values(
+            self.rng.at(self.x_values[in_range]),
+            Config.rnd_tightening_selected_type,
+            Config.rnd_tightening_normal_stadev,
+            Config.rnd_tightening_uniform_range,
+            Config.rnd_tightening_weibull_alpha,
+            size=(self.n, int(in_range.sum())),
+        )
+        y_values[:, in_range] += noise
+        return y_values
+
+    def remove_neg_y_values(self, y_values: np.ndarray, substitute=0) -> np.ndarray:
+        # remove all negative values and insert zero (NaN stays NaN)
+        y_values[y_values < 0] = substitute
+        return y_values
+
+    def apply_horizontal_offset(self, Config: Configuration) -> None:
+        # check if offset needs to be applied
+        if not Config.offset_hori_apply or self.obs_type == "baseline":
+            return
+        # loop over selection
+        for point in Config.offset_hori_selected_points:
+            # get a new offset for every observation
+            offset = get_random_values(
+                self.rng,
+                Config.offset_hori_selected_type,
+                Config.offset_hori_normal_stadev,
+                Config.offset_hori_uniform_range,
+                Config.offset_hori_weibull_alpha,
+                size=self.n,
+            )
+            # apply the offset to the selected point and all following points
+            self.keypoints.shift_x(get_point_index(point), offset)
+
+    def apply_vertical_offset(self, Config: Configuration) -> None:
+        # check if offset needs to be applied
+        if not Config.offset_vert_apply or self.obs_type == "baseline":
+            return
+        # one offset per observation, applied to all selected points
+        offset = get_random_values(
+            self.rng,
+            Config.offset_vert_selected_type,
+            Config.offset_vert_normal_stadev,
+            Config.offset_vert_uniform_range,
+            Config.offset_vert_weibull_alpha,
+            size=self.n,
+        )
+        for point in Config.offset_vert_selected_points:
+            self.keypoints.shift_y(get_point_index(point), offset)
+
+    def apply_type_1_anomaly(self, Config: Configuration) -> None:
+        # get width for all observations
+        width = np.trunc(
+            Config.anomaly_type_1_width
+            + get_random_values(
+                self.rng,
+                Config.anomaly_type_1_width_selected_type,
+                Config.anomaly_type_1_width_normal_stadev,
+                Config.anomaly_type_1_width_uniform_range,
+                Config.anomaly_type_1_width_weibull_alpha,
+                size=self.n,
+            )
+        )
+        # get hight for all observations
+        hight = Config.anomaly_type_1_hight + get_random_values(
+            self.rng,
+            Config.anomaly_type_1_hight_selected_type,
+            Config.anomaly_type_1_hight_normal_stadev,
+            Config.anomaly_type_1_hight_uniform_range,
+            Config.anomaly_type_1_hight_weibull_alpha,
+            size=self.n,
+        )
+
+        # get start of the leap between P1 and P2 (both limits included, like randint)
+        x_steps_min = self.keypoints.x[:, 1] + Config.anomaly_type_1_lower_xlimitation
+        x_steps_max = self.keypoints.x[:, 2] - Config.anomaly_type_1_upper_xlimitation
+        x_steps_max = np.maximum(x_steps_max - width - 1, x_steps_min)
+        start = np.floor(
+            x_steps_min + self.rng.random(self.n) * (x_steps_max - x_steps_min + 1)
+        )
+        end = start + width
+        # get the peak of the leap according to selected shape
+        if Config.anomaly_type_1_leap_shape == "Centered":
+            peak = start + width / 2
+        elif Config.anomaly_type_1_leap_shape == "Right-skewed":
+            peak = start + self.rng.uniform(1, width / 2 - 1)
+        elif Config.anomaly_type_1_leap_shape == "Left-skewed":
+            peak = start + self.rng.uniform(width / 2, width - 1)
+        elif Config.anomaly_type_1_leap_shape == "Random":
+            peak = start + self.rng.uniform(1, width - 1)
+
+        # insert three new steps after P1: previous y value, leap and following y value
+        y_1, y_2 = self.keypoints.y[:, 1], self.keypoints.y[:, 2]
+        self.keypoints.insert(2, [start, peak, end], [y_1, y_1 + hight, y_2])
+
+    def apply_type_2_anomaly(self, Config: Configuration) -> None:
+        # get hight for all observations
+        hight = Config.anomaly_type_2_hight + get_random_values(
+            self.rng,
+            Config.anomaly_type_2_hight_selected_type,
+            Config.anomaly_type_2_hight_normal_stadev,
+            Config.anomaly_type_2_hight_uniform_range,
+            Config.anomaly_type_2_hight_weibull_alpha,
+            size=self.n,
+        )
+        # insert a new step after P4
+        self.keypoints.insert(5, [320.0], [self.keypoints.y[:, 4] + hight])  # randomize
+
+    def apply_type_3_anomaly(self, Config: Configuration) -> None:
+        # get offset for all observations
+        offset = Config.anomaly_type_3_offset + get_random_values(
+            self.rng,
+            Config.anomaly_type_3_offset_selected_type,
+            Config.anomaly_type_3_offset_normal_stadev,
+            Config.anomaly_type_3_offset_uniform_range,
+            Config.anomaly_type_3_offset_weibull_alpha,
+            size=self.n,
+        )
+        # apply offset to x values
+        lower = get_point_index(Config.anomaly_type_3_lower_point)
+        upper = get_point_index(Config.anomaly_type_3_upper_point)
+        self.keypoints.x[:, lower] += offset
+        self.keypoints.x[:, upper] -= offset
+        # round x_steps "back to int"
+        self.keypoints.round_x()
+
+    def apply_type_4_anomaly(self, Config: Configuration) -> None:
+        # get offset for all observations
+        offset = Config.anomaly_type_4_offset + get_random_values(
+            self.rng,
+            Config.anomaly_type_4_offset_selected_type,
+            Config.anomaly_type_4_offset_normal_stadev,
+            Config.anomaly_type_4_offset_uniform_range,
+            Config.anomaly_type_4_offset_weibull_alpha,
+            size=self.n,
+        )
+        # apply offset to x values
+        lower = get_point_index(Config.anomaly_type_4_lower_point)
+        upper = get_point_index(Config.anomaly_type_4_upper_point)
+        self.keypoints.x[:, lower] -= offset
+        self.keypoints.x[:, upper] += offset
+        # round x_steps "back to int"
+        self.keypoints.round_x()
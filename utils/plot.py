@@ -1,12 +1,81 @@
+import warnings
+
 import streamlit as st
+import numpy as np
 
 from bokeh.plotting import figure
-from bokeh.models import ColumnDataSource, LabelSet
+from bokeh.core.properties import expr
+from bokeh.models import ColumnDataSource, CustomJSExpr, LabelSet, LogColorMapper
+from bokeh.palettes import Blues256, Greens256, Reds256
+from typing import Any, Dict, Iterator, Tuple
 from utils.configuration import Configuration
-from utils.observation import Observation
+from utils.downsample import MAX_PLOT_POINTS, get_plot_mask
+from utils.observation import Observation, ObservationBatch
+
+
+# computes the x values of a source from start and step in the browser
+LINE_X_CODE = """
+const x = new Float64Array(this.get_length())
+for (let i = 0; i < x.length; i++) x[i] = start + i * step
+return x
+"""
+# computes the x values of every line of a multi_line from its first x value
+MULTI_LINE_X_CODE = """
+const x_start = this.data.x_start
+return this.data.ys.map((ys, k) => {
+  const x = new Float64Array(ys.length)
+  for (let i = 0; i < x.length; i++) x[i] = x_start[k] + i
+  return x
+})
+"""
+
+
+def get_array(values: Any) -> np.ndarray:
+    """Returns values as contiguous float32 array, which bokeh sends in binary form."""
+    return np.ascontiguousarray(values, dtype=np.float32)
+
+
+def add_x_values(source: ColumnDataSource, x_values: np.ndarray) -> Any:
+    """Adds the x values to a source and returns the x to plot.
+
+    Regular x values (e.g. a grid of rotation angles) are not added as column but as
+    expression of start and step, which is evaluated in the browser.
+    """
+    x_values = np.asarray(x_values, float)
+    if len(x_values) > 1:
+        step = x_values[1] - x_values[0]
+        if np.allclose(np.diff(x_values), step):
+            return expr(
+                CustomJSExpr(
+                    args=dict(start=float(x_values[0]), step=float(step)),
+                    code=LINE_X_CODE,
+                )
+            )
+    source.data["x_values"] = get_array(x_values)
+    return "x_values"
+
 
+def get_multi_line_source(
+    xs: "list[np.ndarray]", ys: "list[np.ndarray]"
+) -> Tuple[ColumnDataSource, Any]:
+    """Returns the source of a multi_line with float32 values and the xs to plot.
 
-def plot_single_observation(Obs: Observation, show_linear_basis: bool) -> None:
+    If every line is sampled on consecutive integer x values, only the first x value
+    of every line is sent and the x values are computed in the browser.
+    """
+    data = dict(ys=[get_array(y_values) for y_values in ys])
+    if all(len(x_values) < 2 or np.all(np.diff(x_values) == 1) for x_values in xs):
+        data["x_start"] = get_array(
+            [x_values[0] if len(x_values) else 0 for x_values in xs]
+        )
+        return ColumnDataSource(data=data), expr(CustomJSExpr(code=MULTI_LINE_X_CODE))
+    data["xs"] = [get_array(x_values) for x_values in xs]
+    return ColumnDataSource(data=data), "xs"
+
+
+def plot_single_observation(
+    Obs: Observation, show_linear_basis: bool, max_points: int = MAX_PLOT_POINTS
+) -> None:
     """Plotting function to display a single Obervation using Bokeh.
 
     Parameters
@@ -15,6 +84,8 @@ def plot_single_observation(Obs: Observation, show_linear_basis: bool) -> None:
         Object to desribe a single screw driving run
     show_lienar_basis : bool
         Adds the linear basis of the Observation to the plot
+    max_points : int
+        Budget of points of the run (downsampled using LTTB), 0 to plot all points
 
     Returns
     ---
@@ -27,17 +98,19 @@ def plot_single_observation(Obs: Observation, show_linear_basis: bool) -> None:
         x_axis_label="Angle of rotation [°]",
         y_axis_label="Torque [Nm]",
     )
-    # define observation data
+    # define observation data (downsampled to the budget of points)
+    x_values, y_values = get_downsampled(Obs, max_points)
     data_observation = ColumnDataSource(
         data=dict(
-            x_values=list(Obs.x_values),
-            y_values=list(Obs.y_values),
-            names=[f"P{i}" for i in range(len(Obs.x_values))],
+            y_values=get_array(y_values),
+            names=[f"P{i}" for i in range(len(x_values))],
         )
     )
+    # send regular x values as start and step only
+    x = add_x_values(data_observation, x_values)
     # plot data
     plot_observation.line(
-        x="x_values",
+        x=x,
         y="y_values",
         source=data_observation,
         color="blue",
@@ -52,22 +125,137 @@ def plot_single_observation(Obs: Observation, show_linear_basis: bool) -> None:
     st.bokeh_chart(figure=plot_observation, use_container_width=True)
 
 
+# number of runs from which all runs are plotted as density instead of lines
+DENSITY_THRESHOLD = 2000
+# number of bins of the density (rotation, torque)
+DENSITY_BINS = (800, 400)
+# palettes of the density for every color of the lines
+DENSITY_PALETTES = {"blue": Blues256, "green": Greens256, "red": Reds256}
+# percentiles of the envelope: outer band, inner band and median
+PERCENTILES = (5, 25, 50, 75, 95)
+# colors of the envelopes of every type of observation
+PERCENTILE_COLORS = {
+    "ok": "green",
+    "anomaly_type_01": "red",
+    "anomaly_type_02": "orange",
+    "anomaly_type_03": "purple",
+    "anomaly_type_04": "brown",
+}
+
+
+def iter_runs(
+    observations: "list[Observation | ObservationBatch]",
+    max_points: "int | None" = None,
+) -> Iterator[Tuple[str, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """Yields obs_type, x_values, y_values, x_steps and y_steps of every single run.
+
+    Parameters
+    ---
+    observations : list[Observation | ObservationBatch]
+        Observations and batches of observations
+    max_points : int or None
+        Downsamples every run to about max_points (see get_plot_mask), None for all
+
+    Returns
+    ---
+    Iterator
+        One tuple per screw run (all values as numpy arrays)
+    """
+    for observation in observations:
+        if isinstance(observation, ObservationBatch):
+            keypoints = observation.keypoints
+            x_values, y_values = observation.x_values, observation.y_values
+            # remove the values outside of the range and the dropped points at once
+            mask = get_plot_mask(x_values, y_values, keypoints.x, max_points)
+            for idx in range(len(observation)):
+                yield (
+                    observation.obs_type,
+                    x_values[mask[idx]],
+                    y_values[idx, mask[idx]],
+                    keypoints.x[idx],
+                    keypoints.y[idx],
+                )
+        else:
+            x_values, y_values = get_downsampled(observation, max_points)
+            yield (
+                observation.obs_type,
+                x_values,
+                y_values,
+                np.array(list(observation.x_steps.values())),
+                np.array(list(observation.y_steps.values())),
+            )
+
+
+def get_downsampled(
+    Obs: Observation, max_points: "int | None" = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the x and y values of an Observation reduced to about max_points."""
+    # the values of an Observation may differ in length by one point
+    length = min(len(Obs.x_values), len(Obs.y_values))
+    x_values = np.asarray(Obs.x_values[:length])
+    y_values = np.asarray(Obs.y_values[:length], float)
+    if not max_points or len(x_values) <= max_points:
+        return x_values, y_values
+    x_steps = np.array(list(Obs.x_steps.values()))
+    mask = get_plot_mask(x_values, y_values[None, :], x_steps, max_points)[0]
+    return x_values[mask], y_values[mask]
+
+
+def get_values(
+    observation: "Observation | ObservationBatch",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the x values and the y values of shape (runs, length) of an observation."""
+    x_values = np.asarray(observation.x_values)
+    y_values = np.atleast_2d(np.asarray(observation.y_values, float))
+    # the values of an Observation may differ in length by one point
+    length = min(len(x_values), y_values.shape[1])
+    return x_values[:length], y_values[:, :length]
+
+
+def get_count(observations: "list[Observation | ObservationBatch]") -> int:
+    """Returns the number of screw runs of all observations and batches."""
+    return sum(
+        len(observation) if isinstance(observation, ObservationBatch) else 1
+        for observation in observations
+    )
+
+
+def get_color(obs_type: str, use_default_color: bool = True) -> str:
+    """Returns the line color of an observation according to its type."""
+    if not use_default_color:
+        if obs_type[:-2] == "anomaly_type_":
+            return "red"
+        if obs_type == "ok":
+            return "green"
+    return "blue"
+
+
 def plot_multiple_observations(
-    observations: "list[Observation]",
+    observations: "list[Observation | ObservationBatch]",
     Config: Configuration,
     plot_title: str = "Add custom Title",
     use_default_color: bool = True,
+    max_points: int = MAX_PLOT_POINTS,
 ) -> None:
-    """Plotting function to display a single Obervation using Bokeh.
+    """Plotting function to display multiple Obervations using Bokeh.
+
+    All runs of the same color are drawn as a single multi_line glyph (WebGL), so the
+    size of the document does not grow with the number of glyphs. From
+    DENSITY_THRESHOLD runs on, the runs are drawn as density images instead, so the
+    costs only depend on the number of bins.
 
     Parameters
     ---
-    observations : list[Observation]
-        Nested list of all observations to plot
+    observations : list[Observation | ObservationBatch]
+        Nested list of all observations (or batches of observations) to plot
     Config : Configuration
         Config file that was used to create the observations
     plot_title :str
         Adds a custon title to the final plot
+    use_default_color : bool
+        Plots all observations in blue instead of green (OK) and red (anomalies)
+    max_points : int
+        Budget of points per run (downsampled using LTTB), 0 to plot all points
 
     Returns
     ---
@@ -79,80 +267,49 @@ def plot_multiple_observations(
         title=plot_title,
         x_axis_label="Rotation [°]",
         y_axis_label="Torque [Nm]",
+        output_backend="webgl",
     )
 
     # get count of all observations
-    count_observations = len(observations)
+    count_observations = get_count(observations)
+
+    # plot large numbers of runs as density
+    if count_observations >= DENSITY_THRESHOLD:
+        with st.spinner(f"Plotting the density of {count_observations} observations"):
+            density = get_density(observations)
+            plot_observation = plot_density(
+                plot_observation, density, use_default_color
+            )
+        if Config.show_linear_basis:
+            plot_observation = plot_linear_basis(plot_observation, Config)
+        st.bokeh_chart(figure=plot_observation, use_container_width=True)
+        return
 
-    # run spinner to iterate process bar while plotting observations
+    # run spinner while collecting the observations to plot
     with st.spinner(f"Plotting {count_observations} observations"):
-        # initialize progress bar
-        bar = st.progress(0)
-
-        # iterate over the total number of observations to plot
-        for idx in range(count_observations):
-            observation = observations[idx]
-
-            # add a basis for each anomaly according to type
-            if Config.show_linear_basis_observation:
-                # and observation.obs_type[:-1] == "anomaly_type_0"
-
-                # display linear basis used for this observation
-                data_anomaly = ColumnDataSource(
-                    data=dict(
-                        x_steps=list(observation.x_steps.values()),
-                        y_steps=list(observation.y_steps.values()),
-                    )
-                )
-                # dashed line for linear interpolation
-                plot_observation.line(
-                    x="x_steps",
-                    y="y_steps",
-                    source=data_anomaly,
-                    line_width=0.5,
-                    line_alpha=0.5,
-                    legend_label="Linear basis of each observation",
-                    color="grey",
-                )
-                plot_observation.circle(
-                    x="x_steps",
-                    y="y_steps",
-                    source=data_anomaly,
-                    color="grey",
-                    line_width=1,
-                )
-                plot_observation.legend.location = "top_left"
+        # group the runs by color
+        lines = {}
+        for obs_type, x_values, y_values, _, _ in iter_runs(observations, max_points):
+            xs, ys = lines.setdefault(get_color(obs_type, use_default_color), ([], []))
+            xs.append(x_values)
+            ys.append(y_values)
 
-            # define the observation data of all values
-            data_observation = ColumnDataSource(
-                data=dict(
-                    x_values=list(observation.x_values),
-                    y_values=list(observation.y_values),
-                )
-            )
-            # get color
-            plot_color = "blue"
-            if not use_default_color:
-                if observation.obs_type[:-2] == "anomaly_type_":
-                    plot_color = "red"
-                if observation.obs_type == "ok":
-                    plot_color = "green"
-            # plot observation data
-            plot_observation.line(
-                x="x_values",
-                y="y_values",
-                source=data_observation,
+        # add a basis for each observation
+        if Config.show_linear_basis_observation and count_observations:
+            plot_observation = plot_linear_bases(plot_observation, observations)
+
+        # plot all observations of one color as a single glyph
+        for plot_color, (xs, ys) in lines.items():
+            source, xs = get_multi_line_source(xs, ys)
+            plot_observation.multi_line(
+                xs=xs,
+                ys="ys",
+                source=source,
                 color=plot_color,
                 line_width=1.5,
                 line_alpha=0.3,
             )
 
-            # update progress bar for according to index
-            bar.progress(int((idx + 1) * (100 / (count_observations))))
-            # unload bar after last observation
-            if count_observations == idx + 1:
-                bar.empty()
-
     # add the linear baseline from the config
     if Config.show_linear_basis:
         plot_observation = plot_linear_basis(plot_observation, Config)
@@ -161,6 +318,309 @@ def plot_multiple_observations(
     st.bokeh_chart(figure=plot_observation, use_container_width=True)
 
 
+def get_linear_bases(
+    observations: "list[Observation | ObservationBatch]",
+) -> Tuple["list[np.ndarray]", "list[np.ndarray]"]:
+    """Returns the x and y values of the linear basis of every run as float32 rows."""
+    x_steps, y_steps = [], []
+    for observation in observations:
+        if isinstance(observation, ObservationBatch):
+            # the rows of the keypoints are views, so no run is copied on its own
+            x_steps.extend(get_array(observation.keypoints.x))
+            y_steps.extend(get_array(observation.keypoints.y))
+        else:
+            x_steps.append(get_array(list(observation.x_steps.values())))
+            y_steps.append(get_array(list(observation.y_steps.values())))
+    return x_steps, y_steps
+
+
+def plot_linear_bases(
+    plot_observation: figure, observations: "list[Observation | ObservationBatch]"
+) -> figure:
+    """Adds the linear basis of every run to an existing bokeh figure.
+
+    The bases of all runs are drawn as one (ragged) multi_line and their points as one
+    scatter glyph, so the overlay costs about the same as one more series of runs.
+
+    Parameters
+    ---
+    plot_observation : figure
+        Existing bokeh figure to which the bases are added
+    observations : list[Observation | ObservationBatch]
+        Observations and batches of observations
+
+    Returns
+    ---
+    figure
+        Figure with the linear basis of every run
+    """
+    x_steps, y_steps = get_linear_bases(observations)
+    # thin line for the linear interpolation of every run
+    plot_observation.multi_line(
+        xs="xs",
+        ys="ys",
+        source=ColumnDataSource(data=dict(xs=x_steps, ys=y_steps)),
+        line_width=0.5,
+        line_alpha=0.5,
+        legend_label="Linear basis of each observation",
+        color="grey",
+    )
+    # marker points of all runs
+    plot_observation.scatter(
+        x=np.concatenate(x_steps),
+        y=np.concatenate(y_steps),
+        color="grey",
+        line_width=1,
+    )
+    plot_observation.legend.location = "top_left"
+    return plot_observation
+
+
+class DensityHistogram:
+    """2D histogram (rotation x torque) of many runs, with one channel per obs_type.
+
+    The runs are added batch by batch (e.g. from a stream of chunks), so the memory and
+    the costs of the plot only depend on the number of bins and not on the number of
+    runs.
+    """
+
+    def __init__(
+        self,
+        x_range: Tuple[float, float],
+        y_range: Tuple[float, float],
+        bins: Tuple[int, int] = DENSITY_BINS,
+    ):
+        self.x_range = x_range
+        self.y_range = y_range
+        self.bins = bins
+        # counts per obs_type with shape (y bins, x bins) as used by the image glyph
+        self.counts = {}
+
+    def add(self, obs_type: str, x_values: np.ndarray, y_values: np.ndarray) -> None:
+        """Adds runs (one row of y_values per run) to a channel, NaN is ignored."""
+        y_values = np.atleast_2d(y_values)
+        x_values = np.broadcast_to(x_values, y_values.shape)
+        valid = ~np.isnan(y_values)
+        # get the bin of every sample
+        nx, ny = self.bins
+        ix = self.get_bin(x_values[valid], self.x_range, nx)
+        iy = self.get_bin(y_values[valid], self.y_range, ny)
+        counts = np.bincount(iy * nx + ix, minlength=nx * ny).reshape(ny, nx)
+        if obs_type in self.counts:
+            self.counts[obs_type] += counts
+        else:
+            self.counts[obs_type] = counts
+
+    def get_percentiles(
+        self, obs_type: str, q: Tuple[float, ...] = PERCENTILES
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the (binned) percentiles q of a channel for every x bin.
+
+        The histogram serves as streaming sketch: the percentiles are precise up to the
+        height of a bin, no matter how many runs were added. Bins without any sample
+        are NaN.
+        """
+        (x0, x1), (y0, y1) = self.x_range, self.y_range
+        nx, ny = self.bins
+        counts = self.counts[obs_type]
+        cumulative = np.cumsum(counts, axis=0)
+        total = cumulative[-1]
+        # first bin in every column whose cumulative count reaches the percentile
+        rank = np.asarray(q, float)[:, None] / 100 * total
+        idx = (cumulative[None, :, :] < rank[:, None, :]).sum(axis=1)
+        y_centers = y0 + (np.arange(ny) + 0.5) * (y1 - y0) / ny
+        values = np.where(total > 0, y_centers[np.minimum(idx, ny - 1)], np.nan)
+        x_centers = x0 + (np.arange(nx) + 0.5) * (x1 - x0) / nx
+        return x_centers, values
+
+    @staticmethod
+    def get_bin(
+        values: np.ndarray, limits: Tuple[float, float], bins: int
+    ) -> np.ndarray:
+        low, high = limits
+        scale = bins / (high - low) if high > low else 0.0
+        return np.clip(((values - low) * scale).astype(np.int64), 0, bins - 1)
+
+
+def get_density(
+    observations: "list[Observation | ObservationBatch]",
+    bins: Tuple[int, int] = DENSITY_BINS,
+) -> DensityHistogram:
+    """Returns the DensityHistogram of all observations on the range they cover."""
+    runs = [(o.obs_type, *get_values(o)) for o in observations]
+    runs = [run for run in runs if np.size(run[2]) and not np.isnan(run[2]).all()]
+    if not runs:
+        return DensityHistogram((0, 1), (0, 1), bins)
+    x_range = (
+        min(x_values[0] for _, x_values, _ in runs),
+        max(x_values[-1] for _, x_values, _ in runs) + 1,
+    )
+    y_range = (
+        min(np.nanmin(y_values) for _, _, y_values in runs),
+        max(np.nanmax(y_values) for _, _, y_values in runs),
+    )
+    density = DensityHistogram(x_range, y_range, bins)
+    for obs_type, x_values, y_values in runs:
+        density.add(obs_type, x_values, y_values)
+    return density
+
+
+def plot_density(
+    plot_observation: figure, density: DensityHistogram, use_default_color: bool = True
+) -> figure:
+    """Adds every channel of a DensityHistogram as image with a log color scale.
+
+    Parameters
+    ---
+    plot_observation : figure
+        Existing bokeh figure to which the images are added
+    density : DensityHistogram
+        Histogram of all runs per obs_type
+    use_default_color : bool
+        Uses the same (blue) palette for all types of observations
+
+    Returns
+    ---
+    figure
+        Figure with one image per obs_type (empty bins are transparent)
+    """
+    (x0, x1), (y0, y1) = density.x_range, density.y_range
+    for obs_type, counts in density.counts.items():
+        palette = DENSITY_PALETTES.get(get_color(obs_type, use_default_color))
+        color_mapper = LogColorMapper(
+            palette=palette[::-1][64:],
+            low=1,
+            high=max(int(counts.max()), 2),
+            nan_color="rgba(0, 0, 0, 0)",
+        )
+        # empty bins are NaN and therefore transparent
+        image = get_array(np.where(counts > 0, counts, np.nan))
+        plot_observation.image(
+            image=[image],
+            x=x0,
+            y=y0,
+            dw=x1 - x0,
+            dh=max(y1 - y0, 1e-9),
+            color_mapper=color_mapper,
+            global_alpha=0.7,
+        )
+    return plot_observation
+
+
+def get_percentiles(
+    observations: "list[Observation | ObservationBatch]",
+    q: Tuple[float, ...] = PERCENTILES,
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Returns the percentiles q of the torque over the rotation for every obs_type.
+
+    All runs of a type are placed on a common grid (NaN outside of their range), so
+    the percentiles are computed in a single np.nanpercentile pass per type.
+
+    Parameters
+    ---
+    observations : list[Observation | ObservationBatch]
+        Observations and batches of observations
+    q : tuple
+        Percentiles to compute (between 0 and 100)
+
+    Returns
+    ---
+    Dict[str, Tuple[np.ndarray, np.ndarray]]
+        x values and the percentiles of shape (len(q), len(x values)) per obs_type
+    """
+    # collect the runs of every type as (x values, y values of shape (runs, length))
+    groups = {}
+    for observation in observations:
+        x_values, y_values = get_values(observation)
+        if y_values.size:
+            groups.setdefault(observation.obs_type, []).append((x_values, y_values))
+
+    percentiles = {}
+    for obs_type, runs in groups.items():
+        first = int(min(x_values[0] for x_values, _ in runs))
+        last = int(max(x_values[-1] for x_values, _ in runs))
+        y_grid = np.full((sum(len(y) for _, y in runs), last - first + 1), np.nan)
+        row = 0
+        for x_values, y_values in runs:
+            start = int(x_values[0]) - first
+            y_grid[row : row + len(y_values), start : start + len(x_values)] = y_values
+            row += len(y_values)
+        with warnings.catch_warnings():
+            # angles without any run are NaN
+            warnings.simplefilter("ignore", RuntimeWarning)
+            values = np.nanpercentile(y_grid, q, axis=0)
+        percentiles[obs_type] = (np.arange(first, last + 1), values)
+    return percentiles
+
+
+def plot_percentiles(
+    observations: "list[Observation | ObservationBatch] | DensityHistogram",
+    Config: Configuration,
+    plot_title: str = "Add custom Title",
+) -> None:
+    """Plotting function to display the percentile envelope of every obs_type (Bokeh).
+
+    The 5-95 and the 25-75 percentile bands are drawn as varea glyphs together with
+    the median over the linear basis of the Configuration. For datasets that do not
+    fit into memory, a DensityHistogram that was filled chunk by chunk can be passed
+    instead of the observations.
+
+    Parameters
+    ---
+    observations : list[Observation | ObservationBatch] or DensityHistogram
+        Observations (or batches of observations) or the histogram of all runs
+    Config : Configuration
+        Config file that was used to create the observations
+    plot_title :str
+        Adds a custon title to the final plot
+
+    Returns
+    ---
+    None
+        Creates a bokeh chart on page that displays the percentile bands
+    """
+    plot_observation = figure(
+        title=plot_title,
+        x_axis_label="Rotation [°]",
+        y_axis_label="Torque [Nm]",
+        output_backend="webgl",
+    )
+    plot_observation = plot_linear_basis(plot_observation, Config, line_color="grey")
+
+    if isinstance(observations, DensityHistogram):
+        percentiles = {
+            obs_type: observations.get_percentiles(obs_type, PERCENTILES)
+            for obs_type in observations.counts
+        }
+    else:
+        percentiles = get_percentiles(observations, PERCENTILES)
+
+    for obs_type, (x_values, values) in percentiles.items():
+        color = PERCENTILE_COLORS.get(obs_type, "blue")
+        source = ColumnDataSource(
+            data={f"p{q:02d}": get_array(v) for q, v in zip(PERCENTILES, values)}
+        )
+        x = add_x_values(source, x_values)
+        plot_observation.varea(
+            x=x, y1="p05", y2="p95", source=source, color=color, alpha=0.15
+        )
+        plot_observation.varea(
+            x=x, y1="p25", y2="p75", source=source, color=color, alpha=0.3
+        )
+        plot_observation.line(
+            x=x,
+            y="p50",
+            source=source,
+            color=color,
+            line_width=2,
+            legend_label=obs_type,
+        )
+    plot_observation.legend.location = "top_left"
+
+    # display chart in page
+    st.bokeh_chart(figure=plot_observation, use_container_width=True)
+
+
 def plot_linear_basis(
     plot_observation: figure, Config: Configuration, line_color: str = "green"
 ) -> None:
@@ -182,8 +642,8 @@ def plot_linear_basis(
     """
     data_baseline = ColumnDataSource(
         data=dict(
-            x_steps=list(Config.x_steps.values()),
-            y_steps=list(Config.y_steps.values()),
+            x_steps=get_array(list(Config.x_steps.values())),
+            y_steps=get_array(list(Config.y_steps.values())),
             names=[f"P{i}" for i in range(len(Config.x_steps.values()))],
         )
     )
@@ -0,0 +1,112 @@
+import time
+
+from threading import Lock
+from typing import Callable, NamedTuple
+
+# minimum time between two reports (in seconds)
+PROGRESS_INTERVAL = 0.25
+
+
+def get_size(nbytes: float) -> str:
+    """Returns a number of bytes in a readable unit (e.g. "12.3 MB")."""
+    for unit in ["B", "kB", "MB", "GB"]:
+        if nbytes < 1000:
+            break
+        nbytes /= 1000
+    return f"{nbytes:.1f} {unit}"
+
+
+class Progress(NamedTuple):
+    """State of a job that is passed to the callback of a ProgressReporter."""
+
+    done: int
+    total: int
+    nbytes: int
+    elapsed: float
+
+    @property
+    def fraction(self) -> float:
+        """Finished part of the job between 0 and 1."""
+        return min(self.done / self.total, 1.0) if self.total else 1.0
+
+    @property
+    def rate(self) -> float:
+        """Screw runs per second."""
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> float:
+        """Estimated remaining time in seconds (inf as long as nothing is done)."""
+        if not self.rate:
+            return float("inf")
+        return max(self.total - self.done, 0) / self.rate
+
+    def __str__(self) -> str:
+        eta = "--" if self.eta == float("inf") else f"{self.eta:.1f}s"
+        return (
+            f"{self.done}/{self.total} screw runs ({self.fraction:.0%}) | "
+            f"{self.rate:.0f} runs/s | {get_size(self.nbytes)} written | ETA {eta}"
+        )
+
+
+class ProgressReporter:
+    """Collects the progress of a job and reports it at most every interval seconds.
+
+    Updating a progress bar (e.g. a websocket message of st.progress) on every chunk
+    can cost more than the job itself, so the callback is only called if the last
+    report is at least interval seconds ago, and once more when the job is closed.
+
+    Parameters
+    ----------
+    total : int
+        Number of screw runs of the whole job.
+    callback : Callable[[Progress], None]
+        Function that displays the progress (e.g. a progress bar or print).
+    interval : float
+        Minimum time between two reports in seconds.
+    """
+
+    def __init__(
+        self,
+        total: int,
+        callback: Callable[[Progress], None],
+        interval: float = PROGRESS_INTERVAL,
+    ):
+        self.total = int(total)
+        self.callback = callback
+        self.interval = interval
+        self.done = 0
+        self.nbytes = 0
+        self.start = time.perf_counter()
+        self.last = float("-inf")
+        # the reporter may be advanced from the threads of a batch engine
+        self.lock = Lock()
+
+    def __enter__(self) -> "ProgressReporter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def get_progress(self) -> Progress:
+        return Progress(
+            self.done, self.total, self.nbytes, time.perf_counter() - self.start
+        )
+
+    def advance(self, runs: int = 0, nbytes: int = 0) -> None:
+        """Adds finished screw runs and written bytes, reports if the interval passed."""
+        with self.lock:
+            self.done += runs
+            self.nbytes += nbytes
+            now = time.perf_counter()
+            if now - self.last < self.interval:
+                return
+            self.last = now
+            progress = self.get_progress()
+        self.callback(progress)
+
+    def close(self) -> None:
+        """Reports the final state of the job."""
+        with self.lock:
+            progress = self.get_progress()
+        self.callback(progress)